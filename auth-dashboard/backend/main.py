@@ -1,21 +1,55 @@
 from __future__ import annotations
 
+import asyncio
+import contextlib
+import csv
+import fcntl
+import functools
+import io
+import json
 import os
+import re
 import subprocess
+import tempfile
+import threading
+import time
+import uuid
 from pathlib import Path
 from dataclasses import dataclass
 from typing import Optional, List
 
-from fastapi import FastAPI, HTTPException
+from fastapi import Depends, FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pacsv
 from fyers_apiv3 import fyersModel
 
 # BASE_DIR -> /.../fyers-swing-docker
 BASE_DIR = Path(__file__).resolve().parents[2]
 CREDENTIALS_FILE = BASE_DIR / "config" / "credentials.env"
 
+DATA_DIR = BASE_DIR / "data"
+RECOMMENDATIONS_FILE = DATA_DIR / "penny_recommendations.csv"
+EXECUTED_FILE = DATA_DIR / "penny_trades_executed.csv"
+
+SCANNER_JOBS_DIR = DATA_DIR / "jobs"
+SCANNER_JOB_ID_RE = re.compile(r"[0-9a-f]{32}")
+# How much of each scanner log the status endpoint returns.
+SCANNER_LOG_TAIL_BYTES = 64 * 1024
+# Job files older than this are deleted when the next job starts.
+SCANNER_JOB_MAX_AGE_S = 7 * 24 * 3600
+
+# KEY=value lines; comments and blank lines never match.
+_ENV_LINE_RE = re.compile(r"^[ \t]*([A-Za-z_][A-Za-z0-9_]*)[ \t]*=[ \t]*(.*?)[ \t\r]*$", re.M)
+# Group 1 is the line's own terminator (CR of a CRLF file), kept on rewrite.
+_ACCESS_TOKEN_RE = re.compile(r"^[ \t]*FYERS_ACCESS_TOKEN=[^\r\n]*(\r?)$", re.M)
+
+# Execution statuses that count as a real trade.
+SUCCESS_STATUSES = pa.array(["ok", "success", "filled", "completed"])
+
 
 @dataclass
 class FyersConfig:
@@ -25,21 +59,37 @@ class FyersConfig:
     app_id_type: int
 
 
+# Parsed env files keyed by path -> (st_mtime_ns, st_size, env). Callers must
+# treat the returned dict as read-only since it is shared between requests.
+_env_cache: dict[Path, tuple[int, int, dict[str, str]]] = {}
+
+# (file_env the config was built from, config)
+_config_cache: tuple[dict[str, str], FyersConfig] | None = None
+
+
 def load_dotenv_like(path: Path) -> dict:
-    env: dict[str, str] = {}
-    if not path.exists():
-        return env
-    for line in path.read_text().splitlines():
-        line = line.strip()
-        if not line or line.startswith("#") or "=" not in line:
-            continue
-        key, value = line.split("=", 1)
-        env[key.strip()] = value.strip()
+    try:
+        st = path.stat()
+    except FileNotFoundError:
+        _env_cache.pop(path, None)
+        return {}
+
+    cached = _env_cache.get(path)
+    if cached is not None and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+        return cached[2]
+
+    text = path.read_text(encoding="utf-8", errors="ignore")
+    env: dict[str, str] = dict(_ENV_LINE_RE.findall(text))
+    _env_cache[path] = (st.st_mtime_ns, st.st_size, env)
     return env
 
 
 def get_fyers_config() -> FyersConfig:
+    global _config_cache
+
     file_env = load_dotenv_like(CREDENTIALS_FILE)
+    if _config_cache is not None and _config_cache[0] is file_env:
+        return _config_cache[1]
 
     def get(key: str, default: str | None = None) -> str | None:
         return os.getenv(key) or file_env.get(key, default)
@@ -64,37 +114,100 @@ def get_fyers_config() -> FyersConfig:
             f"Missing keys in credentials.env ({CREDENTIALS_FILE}): {', '.join(missing)}"
         )
 
-    return FyersConfig(
+    cfg = FyersConfig(
         client_id=client_id,
         secret_key=secret_key,
         redirect_uri=redirect_uri,
         app_id_type=int(app_id_type),
     )
+    _config_cache = (file_env, cfg)
+    return cfg
+
+
+def atomic_write_text(path: Path, text: str) -> None:
+    """
+    Replace path with text without ever exposing a partially written file:
+    write a temp file next to it, fsync, os.replace, then fsync the directory.
+    """
+    try:
+        mode = path.stat().st_mode & 0o777
+    except FileNotFoundError:
+        mode = 0o600
 
+    # Same directory as the target so os.replace never crosses filesystems.
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    tmp = Path(tmp_name)
+    try:
+        try:
+            os.fchmod(fd, mode)
+            data = memoryview(text.encode("utf-8"))
+            while data:
+                data = data[os.write(fd, data):]
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+        os.replace(tmp, path)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+
+    dir_fd = os.open(path.parent, os.O_DIRECTORY)
+    try:
+        os.fsync(dir_fd)
+    finally:
+        os.close(dir_fd)
+
+
+def write_access_token(path: Path, new_token: str) -> bool:
+    """
+    Set FYERS_ACCESS_TOKEN in path, leaving every other line untouched.
+    Returns False (and skips the write) when the file already has that token.
+    """
+    try:
+        # newline="" so CRLF files are read (and written back) as they are.
+        with path.open(encoding="utf-8", newline="") as f:
+            text = f.read()
+    except FileNotFoundError:
+        text = ""
 
-def write_access_token(path: Path, new_token: str) -> None:
-    lines: list[str] = []
-    if path.exists():
-        lines = path.read_text().splitlines()
+    new_line = f"FYERS_ACCESS_TOKEN={new_token}"
+    eol = "\r\n" if "\r\n" in text else "\n"
+    if _ACCESS_TOKEN_RE.search(text):
+        new_text = _ACCESS_TOKEN_RE.sub(lambda m: new_line + m.group(1), text)
+    elif text.strip():
+        new_text = text.rstrip("\r\n") + f"{eol}{eol}{new_line}{eol}"
+    else:
+        new_text = f"{new_line}{eol}"
 
-    key = "FYERS_ACCESS_TOKEN"
-    new_line = f"{key}={new_token}"
+    if new_text == text:
+        return False
 
-    found = False
-    new_lines: list[str] = []
-    for line in lines:
-        if line.strip().startswith(f"{key}="):
-            new_lines.append(new_line)
-            found = True
-        else:
-            new_lines.append(line)
+    atomic_write_text(path, new_text)
+    _env_cache.pop(path, None)
+    return True
+
+
+@functools.lru_cache(maxsize=4)
+def _client_for(client_id: str, token: str) -> fyersModel.FyersModel:
+    return fyersModel.FyersModel(client_id=client_id, token=token)
+
+
+def fyers_client_dep() -> fyersModel.FyersModel:
+    """
+    FastAPI dependency: one FyersModel per (client_id, access token), reused
+    across requests and rebuilt automatically once the token changes.
+    """
+    cfg = get_fyers_config()
+    file_env = load_dotenv_like(CREDENTIALS_FILE)
+    token = os.getenv("FYERS_ACCESS_TOKEN") or file_env.get("FYERS_ACCESS_TOKEN")
 
-    if not found:
-        if new_lines and new_lines[-1].strip():
-            new_lines.append("")
-        new_lines.append(new_line)
+    if not token:
+        raise HTTPException(
+            status_code=400,
+            detail="FYERS_ACCESS_TOKEN missing in credentials.env",
+        )
 
-    path.write_text("\n".join(new_lines) + "\n")
+    return _client_for(cfg.client_id, token)
 
 
 def restart_docker_services() -> str:
@@ -113,29 +226,220 @@ def restart_docker_services() -> str:
         ) from exc
 
 
-def run_scanner_job() -> subprocess.CompletedProcess:
+class ScannerBusyError(RuntimeError):
+    def __init__(self, job_id: str) -> None:
+        super().__init__(f"Scanner job {job_id} is still running.")
+        self.job_id = job_id
+
+
+def _scanner_job_paths(job_id: str) -> tuple[Path, Path, Path]:
+    base = SCANNER_JOBS_DIR / job_id
+    return (
+        base.with_suffix(".status"),
+        base.with_suffix(".out.log"),
+        base.with_suffix(".err.log"),
+    )
+
+
+def _write_scanner_status(job_id: str, status: dict) -> None:
+    status_path, _, _ = _scanner_job_paths(job_id)
+    atomic_write_text(status_path, json.dumps(status))
+
+
+def _wait_scanner_job(job_id: str, proc: subprocess.Popen, status: dict) -> None:
+    return_code = proc.wait()
+    _write_scanner_status(job_id, {**status, "state": "finished", "return_code": return_code})
+
+
+def _proc_stat(pid: int) -> Optional[list[str]]:
+    """
+    Fields of /proc/<pid>/stat after comm, i.e. starting at field 3 (state).
+    None where there is no /proc entry.
+    """
+    try:
+        stat = Path(f"/proc/{pid}/stat").read_text()
+    except OSError:
+        return None
+    # comm (field 2) may contain spaces; the fields after it never do.
+    return stat.rsplit(")", 1)[1].split()
+
+
+def _process_start_ticks(pid: int) -> Optional[str]:
+    """
+    Start time of pid (field 22 of /proc/<pid>/stat), used to tell the job's
+    process from a later one that reused its pid. None where there is no /proc.
+    """
+    fields = _proc_stat(pid)
+    return fields[19] if fields else None
+
+
+def _scanner_process_alive(status: dict) -> bool:
+    pid = status.get("pid")
+    if pid is None:
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+
+    fields = _proc_stat(pid)
+    if fields is None:
+        return True
+    # A zombie has exited; it lingers unreaped when the worker that spawned
+    # it died, so it must not count as a running job.
+    if fields[0] == "Z":
+        return False
+    start_ticks = status.get("start_ticks")
+    return start_ticks is None or fields[19] == start_ticks
+
+
+@contextlib.contextmanager
+def _scanner_start_lock():
+    """
+    Exclusive flock on data/jobs/.start.lock. Held across the running-job check
+    and the launch, so two uvicorn workers can never both start a scanner.
+    """
+    with (SCANNER_JOBS_DIR / ".start.lock").open("a") as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def _sweep_scanner_jobs() -> Optional[str]:
     """
-    Run the penny scanner inside fyers-swing-bot:
+    Delete job files older than SCANNER_JOB_MAX_AGE_S and return the id of a
+    job that is still running, if any.
+    """
+    cutoff = time.time() - SCANNER_JOB_MAX_AGE_S
+    running = None
+    for path in SCANNER_JOBS_DIR.iterdir():
+        job_id = path.name.split(".", 1)[0]
+        if not SCANNER_JOB_ID_RE.fullmatch(job_id):
+            continue
+        try:
+            if path.stat().st_mtime < cutoff:
+                path.unlink(missing_ok=True)
+                continue
+            if path.suffix == ".status" and running is None:
+                status = json.loads(path.read_text())
+                if status.get("state") == "running" and _scanner_process_alive(status):
+                    running = job_id
+        except (OSError, ValueError):
+            continue
+    return running
+
+
+def start_scanner_job() -> str:
+    """
+    Start the penny scanner inside fyers-swing-bot without waiting for it:
       docker compose run --rm fyers-swing-bot python scripts/penny_scanner.py
+
+    Output streams to data/jobs/<job_id>.{out,err}.log and the exit state is
+    recorded in data/jobs/<job_id>.status, so any worker can report on it.
+    Refuses (ScannerBusyError) while another scanner job is still running.
     """
+    SCANNER_JOBS_DIR.mkdir(parents=True, exist_ok=True)
+    with _scanner_start_lock():
+        running = _sweep_scanner_jobs()
+        if running is not None:
+            raise ScannerBusyError(running)
+
+        job_id = uuid.uuid4().hex
+        _, out_path, err_path = _scanner_job_paths(job_id)
+        with out_path.open("wb") as out, err_path.open("wb") as err:
+            try:
+                proc = subprocess.Popen(
+                    [
+                        "docker",
+                        "compose",
+                        "run",
+                        "--rm",
+                        "fyers-swing-bot",
+                        "python",
+                        "scripts/penny_scanner.py",
+                    ],
+                    cwd=str(BASE_DIR),
+                    stdout=out,
+                    stderr=err,
+                )
+            except FileNotFoundError as exc:
+                # No job was started, so leave no orphaned logs behind.
+                out_path.unlink(missing_ok=True)
+                err_path.unlink(missing_ok=True)
+                raise RuntimeError("docker not found on PATH") from exc
+
+        status = {
+            "state": "running",
+            "return_code": None,
+            "pid": proc.pid,
+            "start_ticks": _process_start_ticks(proc.pid),
+            "started_at": time.time(),
+        }
+        _write_scanner_status(job_id, status)
+
+    threading.Thread(
+        target=_wait_scanner_job, args=(job_id, proc, status), daemon=True
+    ).start()
+    return job_id
+
+
+def _tail_text(path: Path, max_bytes: int) -> str:
     try:
-        cp = subprocess.run(
-            [
-                "docker",
-                "compose",
-                "run",
-                "--rm",
-                "fyers-swing-bot",
-                "python",
-                "scripts/penny_scanner.py",
-            ],
-            cwd=str(BASE_DIR),
-            capture_output=True,
-            text=True,
-        )
-        return cp
-    except FileNotFoundError as exc:
-        raise RuntimeError("docker not found on PATH") from exc
+        with path.open("rb") as f:
+            f.seek(0, os.SEEK_END)
+            size = f.tell()
+            f.seek(max(size - max_bytes, 0))
+            return f.read().decode("utf-8", errors="replace")
+    except FileNotFoundError:
+        return ""
+
+
+def read_scanner_job(job_id: str) -> dict | None:
+    if not SCANNER_JOB_ID_RE.fullmatch(job_id):
+        return None
+
+    status_path, out_path, err_path = _scanner_job_paths(job_id)
+    try:
+        status = json.loads(status_path.read_text())
+    except FileNotFoundError:
+        return None
+
+    # A "running" job whose process is gone lost its watcher (worker died or
+    # restarted) and will never be updated; record it as finished, failed.
+    if status["state"] == "running" and not _scanner_process_alive(status):
+        # Re-read first: the watcher may have just recorded the exit code.
+        status = json.loads(status_path.read_text())
+        if status["state"] == "running":
+            status = {**status, "state": "finished", "return_code": None, "lost": True}
+            _write_scanner_status(job_id, status)
+
+    status["stdout"] = _tail_text(out_path, SCANNER_LOG_TAIL_BYTES)
+    status["stderr"] = _tail_text(err_path, SCANNER_LOG_TAIL_BYTES)
+    return status
+
+
+# Parsed CSV rows keyed by path -> (st_mtime_ns, st_size, rows); shared, read-only.
+_csv_rows_cache: dict[Path, tuple[int, int, list[dict]]] = {}
+
+
+def read_csv_rows(path: Path) -> list[dict]:
+    try:
+        st = path.stat()
+    except FileNotFoundError:
+        _csv_rows_cache.pop(path, None)
+        return []
+
+    cached = _csv_rows_cache.get(path)
+    if cached is not None and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+        return cached[2]
+
+    rows = pacsv.read_csv(path).to_pylist()
+    _csv_rows_cache[path] = (st.st_mtime_ns, st.st_size, rows)
+    return rows
 
 
 # ---------- FastAPI app ----------
@@ -211,18 +515,26 @@ class PlaceOrderResponse(BaseModel):
 
 
 class RunScannerResponse(BaseModel):
+    ok: bool
+    message: str
+    job_id: str
+
+
+class ScannerStatusResponse(BaseModel):
+    job_id: str
+    state: str  # running / finished
     ok: bool
     message: str
     stdout: Optional[str] = None
     stderr: Optional[str] = None
-    return_code: int
+    return_code: Optional[int] = None
 
 
 # ---------- Endpoints ----------
 
 @app.get("/api/auth-url", response_model=AuthUrlResponse)
-def generate_auth_url() -> AuthUrlResponse:
-    cfg = get_fyers_config()
+async def generate_auth_url() -> AuthUrlResponse:
+    cfg = await asyncio.to_thread(get_fyers_config)
 
     session = fyersModel.SessionModel(
         client_id=cfg.client_id,
@@ -231,13 +543,13 @@ def generate_auth_url() -> AuthUrlResponse:
         response_type="code",
         grant_type="authorization_code",
     )
-    login_url = session.generate_authcode()
+    login_url = await asyncio.to_thread(session.generate_authcode)
     return AuthUrlResponse(login_url=login_url)
 
 
 @app.post("/api/exchange", response_model=ExchangeResponse)
-def exchange_auth_code(body: ExchangeRequest) -> ExchangeResponse:
-    cfg = get_fyers_config()
+async def exchange_auth_code(body: ExchangeRequest) -> ExchangeResponse:
+    cfg = await asyncio.to_thread(get_fyers_config)
 
     session = fyersModel.SessionModel(
         client_id=cfg.client_id,
@@ -252,7 +564,7 @@ def exchange_auth_code(body: ExchangeRequest) -> ExchangeResponse:
         raise HTTPException(status_code=400, detail="auth_code must not be empty")
 
     session.set_token(auth_code)
-    resp = session.generate_token()
+    resp = await asyncio.to_thread(session.generate_token)
 
     if str(resp.get("s", "")).lower() != "ok":
         raise HTTPException(status_code=400, detail=f"Token exchange failed: {resp}")
@@ -269,40 +581,34 @@ def exchange_auth_code(body: ExchangeRequest) -> ExchangeResponse:
 
 
 @app.post("/api/save-token", response_model=SaveTokenResponse)
-def save_token(body: SaveTokenRequest) -> SaveTokenResponse:
+async def save_token(body: SaveTokenRequest) -> SaveTokenResponse:
     token = body.access_token.strip()
     if not token:
         raise HTTPException(status_code=400, detail="access_token must not be empty")
 
-    write_access_token(CREDENTIALS_FILE, token)
+    changed = await asyncio.to_thread(write_access_token, CREDENTIALS_FILE, token)
+    if changed:
+        _client_for.cache_clear()
 
     docker_output: Optional[str] = None
     if body.restart_docker:
         try:
-            docker_output = restart_docker_services()
+            docker_output = await asyncio.to_thread(restart_docker_services)
         except RuntimeError as exc:
             raise HTTPException(status_code=500, detail=str(exc)) from exc
 
     return SaveTokenResponse(
-        message="Token saved successfully" + (" and Docker services restarted." if body.restart_docker else "."),
+        message=("Token saved successfully" if changed else "Token unchanged")
+        + (" and Docker services restarted." if body.restart_docker else "."),
         docker_output=docker_output,
     )
 
 
 @app.get("/api/test-profile", response_model=ProfileResponse)
-def test_profile() -> ProfileResponse:
-    cfg = get_fyers_config()
-    file_env = load_dotenv_like(CREDENTIALS_FILE)
-    token = os.getenv("FYERS_ACCESS_TOKEN") or file_env.get("FYERS_ACCESS_TOKEN")
-
-    if not token:
-        raise HTTPException(
-            status_code=400,
-            detail="FYERS_ACCESS_TOKEN missing in credentials.env",
-        )
-
-    f = fyersModel.FyersModel(client_id=cfg.client_id, token=token)
-    resp = f.get_profile()
+async def test_profile(
+    fy: fyersModel.FyersModel = Depends(fyers_client_dep),
+) -> ProfileResponse:
+    resp = await asyncio.to_thread(fy.get_profile)
 
     ok = str(resp.get("s", "")).lower() == "ok" and resp.get("code") == 200
     msg = "Authenticated OK" if ok else f"Auth failed: {resp.get('message', 'Unknown error')}"
@@ -310,28 +616,19 @@ def test_profile() -> ProfileResponse:
     return ProfileResponse(ok=ok, message=msg, raw=resp)
 
 
-@app.get("/api/recommendations", response_model=RecommendationsResponse)
-def list_recommendations() -> RecommendationsResponse:
-    import pandas as pd
-
-    path = BASE_DIR / "data" / "penny_recommendations.csv"
-    if not path.exists():
-        return RecommendationsResponse(rows=[])
+# The CSV listing endpoints return the rows dict as is, without building the
+# model first; FastAPI validates and serializes it against response_model once.
 
-    df = pd.read_csv(path)
-    return RecommendationsResponse(rows=df.to_dict(orient="records"))
+@app.get("/api/recommendations", response_model=RecommendationsResponse)
+async def list_recommendations() -> dict:
+    rows = await asyncio.to_thread(read_csv_rows, RECOMMENDATIONS_FILE)
+    return {"rows": rows}
 
 
 @app.get("/api/executed", response_model=ExecutedTradesResponse)
-def list_executed() -> ExecutedTradesResponse:
-    import pandas as pd
-
-    path = BASE_DIR / "data" / "penny_trades_executed.csv"
-    if not path.exists():
-        return ExecutedTradesResponse(rows=[])
-
-    df = pd.read_csv(path)
-    return ExecutedTradesResponse(rows=df.to_dict(orient="records"))
+async def list_executed() -> dict:
+    rows = await asyncio.to_thread(read_csv_rows, EXECUTED_FILE)
+    return {"rows": rows}
 
 
 @app.post("/api/clear-error-executions", response_model=ClearExecutedResponse)
@@ -339,42 +636,46 @@ def clear_error_executions() -> ClearExecutedResponse:
     """
     Keep only successful/OK executions in penny_trades_executed.csv.
     """
-    import pandas as pd
-
-    path = BASE_DIR / "data" / "penny_trades_executed.csv"
+    path = EXECUTED_FILE
     if not path.exists():
         return ClearExecutedResponse(message="File not found; nothing to clear.", removed_rows=0)
 
-    df = pd.read_csv(path)
-    if "status" not in df.columns:
+    with path.open(newline="", encoding="utf-8") as f:
+        header_line = f.readline()
+    header = next(csv.reader([header_line]), [])
+    if "status" not in header:
         return ClearExecutedResponse(message="No 'status' column; nothing to clear.", removed_rows=0)
 
-    before = len(df)
-    keep_mask = df["status"].astype(str).str.lower().isin(["ok", "success", "filled", "completed"])
-    df_clean = df[keep_mask].copy()
-    removed = before - len(df_clean)
-    df_clean.to_csv(path, index=False)
+    # Every column as text, so kept rows are written back exactly as read.
+    table = pacsv.read_csv(
+        path,
+        convert_options=pacsv.ConvertOptions(column_types={c: pa.string() for c in header}),
+    )
+    before = table.num_rows
+    status = pc.utf8_lower(table["status"])
+    # Blank statuses read as "" and are never in SUCCESS_STATUSES.
+    kept = table.filter(pc.is_in(status, value_set=SUCCESS_STATUSES))
+    removed = before - kept.num_rows
+
+    # csv.writer rather than pacsv.write_csv: the latter quotes every string
+    # field and header. Same dialect and line ending as the file's writer.
+    out = io.StringIO()
+    writer = csv.writer(out, lineterminator="\r\n" if header_line.endswith("\r\n") else "\n")
+    writer.writerow(kept.column_names)
+    writer.writerows(zip(*(col.to_pylist() for col in kept.columns)))
+    atomic_write_text(path, out.getvalue())
 
     return ClearExecutedResponse(
-        message=f"Removed {removed} non-success rows; kept {len(df_clean)} successful executions.",
+        message=f"Removed {removed} non-success rows; kept {kept.num_rows} successful executions.",
         removed_rows=removed,
     )
 
 
 @app.post("/api/place-order", response_model=PlaceOrderResponse)
-def place_order(body: PlaceOrderRequest) -> PlaceOrderResponse:
-    cfg = get_fyers_config()
-    file_env = load_dotenv_like(CREDENTIALS_FILE)
-    token = os.getenv("FYERS_ACCESS_TOKEN") or file_env.get("FYERS_ACCESS_TOKEN")
-
-    if not token:
-        raise HTTPException(
-            status_code=400,
-            detail="FYERS_ACCESS_TOKEN missing in credentials.env",
-        )
-
-    fy = fyersModel.FyersModel(client_id=cfg.client_id, token=token)
-
+async def place_order(
+    body: PlaceOrderRequest,
+    fy: fyersModel.FyersModel = Depends(fyers_client_dep),
+) -> PlaceOrderResponse:
     side = body.side.upper()
     if side not in ("BUY", "SELL"):
         raise HTTPException(status_code=400, detail="side must be BUY or SELL")
@@ -393,7 +694,7 @@ def place_order(body: PlaceOrderRequest) -> PlaceOrderResponse:
         "orderTag": "dashboard",
     }
 
-    resp = fy.place_order(order)
+    resp = await asyncio.to_thread(fy.place_order, order)
     ok = str(resp.get("s", "")).lower() == "ok"
 
     return PlaceOrderResponse(
@@ -404,22 +705,42 @@ def place_order(body: PlaceOrderRequest) -> PlaceOrderResponse:
 
 
 @app.post("/api/run-scanner", response_model=RunScannerResponse)
-def run_scanner() -> RunScannerResponse:
+async def run_scanner() -> RunScannerResponse:
     """
-    Run scripts/penny_scanner.py inside fyers-swing-bot via docker compose.
+    Start scripts/penny_scanner.py inside fyers-swing-bot via docker compose.
+    Returns immediately; poll /api/scanner-status/{job_id} for the result.
     """
     try:
-        cp = run_scanner_job()
+        job_id = await asyncio.to_thread(start_scanner_job)
+    except ScannerBusyError as exc:
+        raise HTTPException(status_code=409, detail=str(exc)) from exc
     except RuntimeError as exc:
         raise HTTPException(status_code=500, detail=str(exc)) from exc
 
-    ok = cp.returncode == 0
-    msg = "Scanner completed successfully." if ok else "Scanner failed."
+    return RunScannerResponse(ok=True, message="Scanner started.", job_id=job_id)
+
+
+@app.get("/api/scanner-status/{job_id}", response_model=ScannerStatusResponse)
+async def scanner_status(job_id: str) -> ScannerStatusResponse:
+    status = await asyncio.to_thread(read_scanner_job, job_id)
+    if status is None:
+        raise HTTPException(status_code=404, detail=f"Unknown scanner job: {job_id}")
+
+    return_code = status.get("return_code")
+    if status["state"] == "running":
+        ok, msg = True, "Scanner running..."
+    elif status.get("lost"):
+        ok, msg = False, "Scanner process exited without recording a result."
+    else:
+        ok = return_code == 0
+        msg = "Scanner completed successfully." if ok else "Scanner failed."
 
-    return RunScannerResponse(
+    return ScannerStatusResponse(
+        job_id=job_id,
+        state=status["state"],
         ok=ok,
         message=msg,
-        stdout=cp.stdout or "",
-        stderr=cp.stderr or "",
-        return_code=cp.returncode,
+        stdout=status["stdout"],
+        stderr=status["stderr"],
+        return_code=return_code,
     )
@@ -13,8 +13,13 @@ const API_ENDPOINTS = {
   CLEAR_ERRORS: "/api/clear-error-executions",
   PLACE_ORDER: "/api/place-order",
   RUN_SCANNER: "/api/run-scanner",
+  SCANNER_STATUS: "/api/scanner-status",
 };
 
+const SCANNER_POLL_MS = 2000;
+
+const sleep = (ms) => new Promise((resolve) => setTimeout(resolve, ms));
+
 async function apiCall(path, options = {}) {
   const res = await fetch(`${API_BASE}${path}`, {
     headers: { "Content-Type": "application/json" },
@@ -45,11 +50,11 @@ function useApiCall() {
     }
   };
 
-  return { call, loading, errorMsg, setErrorMsg };
+  return { call, loading, setLoading, errorMsg, setErrorMsg };
 }
 
 function App() {
-  const { call, loading, errorMsg, setErrorMsg } = useApiCall();
+  const { call, loading, setLoading, errorMsg, setErrorMsg } = useApiCall();
 
   const [loginUrl, setLoginUrl] = useState("");
   const [authCode, setAuthCode] = useState("");
@@ -222,10 +227,19 @@ function App() {
       setErrorMsg("");
       setScannerResult(null);
       setLoading("scanner");
-      const data = await call("scanner", API_ENDPOINTS.RUN_SCANNER, {
+      // apiCall, not call(): call() clears `loading` after every request, which
+      // would re-enable the Run button while the job is still being polled.
+      const { job_id } = await apiCall(API_ENDPOINTS.RUN_SCANNER, {
         method: "POST",
       });
-      setScannerResult(data);
+      const statusPath = `${API_ENDPOINTS.SCANNER_STATUS}/${job_id}`;
+      let status = await apiCall(statusPath);
+      while (status.state === "running") {
+        setScannerResult(status);
+        await sleep(SCANNER_POLL_MS);
+        status = await apiCall(statusPath);
+      }
+      setScannerResult(status);
     } catch (err) {
       setErrorMsg(err.message);
     } finally {
@@ -1,21 +1,51 @@
 import os
+from functools import lru_cache
+
+import requests
 from fyers_apiv3 import fyersModel
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 CLIENT_ID = os.getenv("FYERS_CLIENT_ID")
 SECRET_KEY = os.getenv("FYERS_SECRET_KEY")
 REDIRECT_URI = os.getenv("FYERS_REDIRECT_URI")
 ACCESS_TOKEN = os.getenv("FYERS_ACCESS_TOKEN")
 
+# Keep-alive connections per host; must cover data_feed.MAX_HISTORY_WORKERS.
+HTTP_POOL_SIZE = 20
+
+
+def _mount_keepalive_pool(fyers: fyersModel.FyersModel) -> None:
+    # The sync SDK client issues every call through service.session
+    # (a requests.Session); widen its pool so concurrent history requests
+    # reuse TLS connections instead of opening new ones.
+    session = getattr(getattr(fyers, "service", None), "session", None)
+    if not isinstance(session, requests.Session):
+        return
+    adapter = HTTPAdapter(
+        pool_connections=HTTP_POOL_SIZE,
+        pool_maxsize=HTTP_POOL_SIZE,
+        # Only GETs are retried on read errors so orders are never re-sent.
+        max_retries=Retry(total=3, backoff_factor=0.2, allowed_methods=frozenset({"GET"})),
+    )
+    session.mount("https://", adapter)
 
-def get_fyers_client() -> fyersModel.FyersModel:
-    if not CLIENT_ID or not SECRET_KEY or not ACCESS_TOKEN:
-        raise RuntimeError("FYERS credentials or access token not set in environment variables.")
 
+@lru_cache(maxsize=4)
+def _client_for(client_id: str, token: str) -> fyersModel.FyersModel:
     # Fyers v3 docs: token should be the access_token string, client_id is app_id (e.g., F08DGQJ3AM-100)
     fyers = fyersModel.FyersModel(
-        client_id=CLIENT_ID,
-        token=ACCESS_TOKEN,
+        client_id=client_id,
+        token=token,
         is_async=False,
         log_path="logs",
     )
+    _mount_keepalive_pool(fyers)
     return fyers
+
+
+def get_fyers_client() -> fyersModel.FyersModel:
+    if not CLIENT_ID or not SECRET_KEY or not ACCESS_TOKEN:
+        raise RuntimeError("FYERS credentials or access token not set in environment variables.")
+
+    return _client_for(CLIENT_ID, ACCESS_TOKEN)
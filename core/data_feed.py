@@ -1,13 +1,22 @@
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta
 import os
 import json
+import numpy as np
 import pandas as pd
 
 from core.auth import get_fyers_client
+from core.logging_sink import get_sink
 
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HISTORY_DEBUG_LOG = os.path.join(PROJECT_ROOT, "logs", "history_debug.log")
 
-def get_historical_ohlc(symbol: str, days: int = 200, timeframe: str = "D") -> pd.DataFrame:
-    fyers = get_fyers_client()
+# Fyers v3 has no multi-symbol history endpoint, so batches are fanned out
+# over this many concurrent requests sharing one client.
+MAX_HISTORY_WORKERS = 8
+
+
+def _fetch_history(fyers, symbol: str, days: int, timeframe: str) -> pd.DataFrame:
     to_date = datetime.now()
     from_date = to_date - timedelta(days=days * 2)
 
@@ -25,17 +34,57 @@ def get_historical_ohlc(symbol: str, days: int = 200, timeframe: str = "D") -> p
 
     if not candles:
         # Log the raw response so we can see what Fyers is sending back
-        logs_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "logs")
-        os.makedirs(logs_dir, exist_ok=True)
-        log_path = os.path.join(logs_dir, "history_debug.log")
-        with open(log_path, "a") as f:
-            f.write(f"\n[{datetime.now().isoformat()}] Symbol: {symbol}\n")
-            f.write(json.dumps(resp) + "\n")
+        get_sink().emit(
+            HISTORY_DEBUG_LOG,
+            f"\n[{datetime.now().isoformat()}] Symbol: {symbol}\n" + json.dumps(resp) + "\n",
+        )
         return pd.DataFrame()
 
-    cols = ["timestamp", "open", "high", "low", "close", "volume"]
-    df = pd.DataFrame(candles, columns=cols)
-    df["datetime"] = pd.to_datetime(df["timestamp"], unit="s")
-    df.set_index("datetime", inplace=True)
-    df.drop(columns=["timestamp"], inplace=True)
-    return df
+    # candles: [[epoch_s, open, high, low, close, volume], ...]. Build the
+    # columns and index straight from one array instead of set_index/drop copies.
+    arr = np.asarray(candles, dtype=np.float64)
+    idx = pd.to_datetime(arr[:, 0].astype(np.int64), unit="s")
+    idx.name = "datetime"
+    return pd.DataFrame(
+        {
+            "open": arr[:, 1],
+            "high": arr[:, 2],
+            "low": arr[:, 3],
+            "close": arr[:, 4],
+            "volume": arr[:, 5],
+        },
+        index=idx,
+    )
+
+
+def get_historical_ohlc(symbol: str, days: int = 200, timeframe: str = "D") -> pd.DataFrame:
+    return _fetch_history(get_fyers_client(), symbol, days, timeframe)
+
+
+def get_historical_ohlc_batch(
+    symbols: list[str],
+    days: int = 200,
+    timeframe: str = "D",
+    max_workers: int = MAX_HISTORY_WORKERS,
+) -> dict[str, pd.DataFrame]:
+    """
+    Fetch history for many symbols with one shared client and at most
+    max_workers requests in flight. Symbols that fail map to an empty frame.
+    """
+    if not symbols:
+        return {}
+
+    fyers = get_fyers_client()
+    results: dict[str, pd.DataFrame] = {}
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(symbols))) as ex:
+        futures = {
+            ex.submit(_fetch_history, fyers, sym, days, timeframe): sym for sym in symbols
+        }
+        for fut in as_completed(futures):
+            sym = futures[fut]
+            try:
+                results[sym] = fut.result()
+            except Exception as exc:
+                print(f"History request failed for {sym}: {exc}")
+                results[sym] = pd.DataFrame()
+    return results
@@ -0,0 +1,109 @@
+import atexit
+import os
+import queue
+import threading
+from typing import Optional
+
+# Flush open files after this many records, or after this many seconds idle.
+FLUSH_EVERY = 50
+FLUSH_INTERVAL_S = 0.5
+
+_STOP = object()
+
+
+class LogSink:
+    """
+    Append-only writer for log/CSV files shared by the jobs.
+
+    emit() only enqueues; a daemon thread keeps one O_APPEND handle per path
+    and flushes in batches, so callers never block on open/close.
+    """
+
+    def __init__(self, flush_every: int = FLUSH_EVERY, flush_interval: float = FLUSH_INTERVAL_S) -> None:
+        self._flush_every = flush_every
+        self._flush_interval = flush_interval
+        self._queue: queue.Queue = queue.Queue()
+        self._handles: dict = {}
+        self._pending = 0
+        self._thread = threading.Thread(target=self._run, name="log-sink", daemon=True)
+        self._thread.start()
+
+    def emit(self, path: str, text: str, header: Optional[str] = None) -> None:
+        """
+        Queue text for appending to path. header is written first if the
+        file is empty when the sink opens it.
+        """
+        self._queue.put((path, text, header))
+
+    def flush(self) -> None:
+        """Block until everything emitted so far is written and flushed."""
+        done = threading.Event()
+        self._queue.put(done)
+        done.wait()
+
+    def close(self) -> None:
+        if self._thread.is_alive():
+            self._queue.put(_STOP)
+            self._thread.join()
+
+    def _open(self, path: str, header: Optional[str]):
+        handle = self._handles.get(path)
+        if handle is None:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+            handle = os.fdopen(fd, "a")
+            if header and os.fstat(fd).st_size == 0:
+                handle.write(header)
+            self._handles[path] = handle
+        return handle
+
+    def _flush_all(self) -> None:
+        for handle in self._handles.values():
+            handle.flush()
+        self._pending = 0
+
+    def _run(self) -> None:
+        while True:
+            try:
+                item = self._queue.get(timeout=self._flush_interval)
+            except queue.Empty:
+                if self._pending:
+                    self._flush_all()
+                continue
+
+            if item is _STOP:
+                break
+            if isinstance(item, threading.Event):
+                self._flush_all()
+                item.set()
+                continue
+
+            path, text, header = item
+            try:
+                self._open(path, header).write(text)
+            except OSError as exc:
+                print(f"log-sink: failed to write {path}: {exc}")
+                continue
+            self._pending += 1
+            if self._pending >= self._flush_every:
+                self._flush_all()
+
+        self._flush_all()
+        for handle in self._handles.values():
+            handle.close()
+        self._handles.clear()
+
+
+_sink: Optional[LogSink] = None
+_sink_lock = threading.Lock()
+
+
+def get_sink() -> LogSink:
+    """Process-wide sink, started on first use and drained at exit."""
+    global _sink
+    if _sink is None:
+        with _sink_lock:
+            if _sink is None:
+                _sink = LogSink()
+                atexit.register(_sink.close)
+    return _sink
@@ -5,10 +5,24 @@ import math
 PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 SETTINGS_PATH = os.path.join(PROJECT_ROOT, "config", "settings.yaml")
 
+# libyaml-backed loader when PyYAML was built with it; pure-Python otherwise.
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+# (st_mtime_ns, settings) for SETTINGS_PATH. Shared: treat the dict as read-only.
+_SETTINGS_CACHE: tuple[int, dict] | None = None
+
 
 def load_settings():
+    global _SETTINGS_CACHE
+
+    mtime_ns = os.stat(SETTINGS_PATH).st_mtime_ns
+    if _SETTINGS_CACHE is not None and _SETTINGS_CACHE[0] == mtime_ns:
+        return _SETTINGS_CACHE[1]
+
     with open(SETTINGS_PATH, "r") as f:
-        return yaml.safe_load(f)
+        settings = yaml.load(f, Loader=_YAML_LOADER)
+    _SETTINGS_CACHE = (mtime_ns, settings)
+    return settings
 
 
 class RiskManager:
@@ -17,6 +31,7 @@ class RiskManager:
         self.capital = self.settings["capital"]
         self.risk_per_trade_pct = self.settings["risk_per_trade_pct"]
         self.max_open_positions = self.settings["max_open_positions"]
+        self.stop_loss_pct = self.settings["strategy"]["exit"]["stop_loss_pct"]
 
     def position_size(self, entry_price: float, stop_loss_price: float, current_open_positions: int) -> int:
         if current_open_positions >= self.max_open_positions:
@@ -1,13 +1,4 @@
-import os
-import yaml
-
-PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-SETTINGS_PATH = os.path.join(PROJECT_ROOT, "config", "settings.yaml")
-
-
-def load_settings():
-    with open(SETTINGS_PATH, "r") as f:
-        return yaml.safe_load(f)
+from core.risk_manager import load_settings
 
 
 def get_universe() -> list:
@@ -3,7 +3,7 @@ import json
 from datetime import datetime
 
 from core.universe import get_universe
-from core.data_feed import get_historical_ohlc
+from core.data_feed import get_historical_ohlc_batch
 from strategies.swing_trend import SwingTrendStrategy
 
 PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -15,11 +15,18 @@ def run_daily_scan():
     strategy = SwingTrendStrategy()
     signals = []
 
+    histories = get_historical_ohlc_batch(universe, days=250, timeframe="D")
+
+    # Walk the universe (not completion order) so the output stays stable.
     for sym in universe:
-        df = get_historical_ohlc(sym, days=250, timeframe="D")
-        if df.empty:
+        df = histories.get(sym)
+        if df is None or df.empty:
+            continue
+        try:
+            sig = strategy.generate_signal(sym, df)
+        except Exception as exc:
+            print(f"Skipping {sym}: {exc}")
             continue
-        sig = strategy.generate_signal(sym, df)
         if sig:
             signals.append(sig)
 
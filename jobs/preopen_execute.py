@@ -4,6 +4,7 @@ from datetime import datetime
 
 from core.risk_manager import RiskManager
 from core.order_manager import OrderManager
+from core.logging_sink import get_sink
 
 PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 SIGNALS_FILE = os.path.join(PROJECT_ROOT, "data", "daily_signals.json")
@@ -19,15 +20,12 @@ def load_signals():
 
 
 def append_trade_log(row: dict):
-    os.makedirs(os.path.dirname(TRADES_LOG), exist_ok=True)
-    header_exists = os.path.exists(TRADES_LOG)
-    with open(TRADES_LOG, "a") as f:
-        if not header_exists:
-            f.write("datetime,symbol,side,qty,entry_price,order_resp\n")
-        f.write(
-            f'{row["datetime"]},{row["symbol"]},{row["side"]},'
-            f'{row["qty"]},{row["entry_price"]},{row["order_resp"]}\n'
-        )
+    get_sink().emit(
+        TRADES_LOG,
+        f'{row["datetime"]},{row["symbol"]},{row["side"]},'
+        f'{row["qty"]},{row["entry_price"]},{row["order_resp"]}\n',
+        header="datetime,symbol,side,qty,entry_price,order_resp\n",
+    )
 
 
 def execute_preopen_orders():
@@ -40,7 +38,7 @@ def execute_preopen_orders():
     om = OrderManager()
     current_open_positions = 0  # TODO: fetch from positions API for production
 
-    stop_loss_pct = rm.settings["strategy"]["exit"]["stop_loss_pct"]
+    stop_loss_pct = rm.stop_loss_pct
 
     for sig in signals:
         symbol = sig["symbol"]
@@ -66,6 +64,8 @@ def execute_preopen_orders():
         }
         append_trade_log(log_row)
 
+    get_sink().flush()
+
 
 if __name__ == "__main__":
     execute_preopen_orders()
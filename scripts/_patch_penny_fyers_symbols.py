@@ -1,9 +1,10 @@
-import pandas as pd
 from pathlib import Path
 
+from csv_io import read_csv
+
 path = Path("data") / "penny_fundamentals.csv"
 print(f"Loading {path} ...")
-df = pd.read_csv(path)
+df = read_csv(path, dtype={"symbol": str, "fyers_symbol": str})
 
 if "fyers_symbol" not in df.columns:
     df["fyers_symbol"] = ""
@@ -17,10 +18,13 @@ mapping = {
 if "symbol" not in df.columns:
     raise SystemExit("ERROR: 'symbol' column not found in penny_fundamentals.csv")
 
+sym_upper = df["symbol"].astype(str).str.upper()
+patched = sym_upper.map(mapping)
+found = set(sym_upper[patched.notna()])
+df["fyers_symbol"] = patched.fillna(df["fyers_symbol"])
+
 for sym, fy in mapping.items():
-    mask = df["symbol"].astype(str).str.upper().eq(sym)
-    if mask.any():
-        df.loc[mask, "fyers_symbol"] = fy
+    if sym in found:
         print(f"Set fyers_symbol={fy} for symbol={sym}")
     else:
         print(f"WARNING: symbol={sym} not found in CSV")
@@ -0,0 +1,21 @@
+import logging
+from pathlib import Path
+
+import pandas as pd
+
+
+def read_csv(path: Path | str, **kwargs) -> pd.DataFrame:
+    """
+    pd.read_csv with the multithreaded pyarrow parser when it is available.
+
+    Falls back to the C engine (low_memory=False, cache_dates=True) if pyarrow
+    is not installed or rejects one of the given options.
+    """
+    try:
+        return pd.read_csv(path, engine="pyarrow", **kwargs)
+    except ImportError:
+        pass
+    except ValueError as exc:
+        logging.debug("pyarrow CSV engine failed for %s (%s); using C engine.", path, exc)
+
+    return pd.read_csv(path, engine="c", low_memory=False, cache_dates=True, **kwargs)
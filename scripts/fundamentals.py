@@ -1,10 +1,36 @@
 import logging
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict, List, Optional
 
+import numpy as np
 import pandas as pd
 
+from csv_io import read_csv
+from parquet_cache import read_parquet_cache, write_parquet_cache
+
+# Numeric fundamentals columns, in FundamentalRecord field order.
+NUMERIC_COLS = (
+    "cmp",
+    "pe",
+    "mar_cap_cr",
+    "div_yld_pct",
+    "np_qtr_cr",
+    "qtr_profit_var_pct",
+    "sales_qtr_cr",
+    "qtr_sales_var_pct",
+    "roce_pct",
+    "debt_eq",
+)
+
+# Version of the frame _normalize() produces, stored in the Parquet sidecar.
+# Bump it whenever _normalize() changes, so old sidecars are rebuilt.
+CACHE_VERSION = "1"
+
+# Read as text so codes like "500325" or "TRUE" are never type-inferred.
+TEXT_DTYPES = {col: str for col in ("symbol", "name", "yf_symbol", "fyers_symbol", "exchange")}
+
 
 @dataclass
 class FundamentalRecord:
@@ -30,6 +56,9 @@ class FundamentalsRepository:
     Single Responsibility:
       - Load and validate fundamentals from CSV
       - Provide domain objects to the scanner
+
+    get_frame() exposes the same data as typed columns; prefer it for batch
+    filtering/scoring. get_all()/get() build FundamentalRecord objects from it.
     """
 
     def __init__(
@@ -37,89 +66,189 @@ class FundamentalsRepository:
         csv_path: Path | str = Path("data") / "penny_fundamentals.csv",
     ) -> None:
         self._path = Path(csv_path)
+        self._df: Optional[pd.DataFrame] = None
         self._records: Dict[str, FundamentalRecord] = {}
-
-    def load(self) -> List[FundamentalRecord]:
-        if not self._path.exists():
+        self._loaded_mtime_ns: Optional[int] = None
+
+    @property
+    def _cache_path(self) -> Path:
+        return self._path.with_suffix(".parquet")
+
+    def _normalize(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Coerce a raw fundamentals CSV into typed columns (TEXT_COLS + NUMERIC_COLS),
+        dropping rows without a symbol or a valid CMP.
+        """
+
+        def text_col(col: str) -> pd.Series:
+            if col not in df.columns:
+                return pd.Series("", index=df.index, dtype=object)
+            return df[col].fillna("").astype(str).str.strip()
+
+        symbol = text_col("symbol").str.upper()
+        has_symbol = symbol != ""
+        df, symbol = df[has_symbol], symbol[has_symbol]
+
+        num = pd.DataFrame(
+            {
+                col: pd.to_numeric(df[col], errors="coerce").astype("float64")
+                if col in df.columns
+                else pd.Series(np.nan, index=df.index)
+                for col in NUMERIC_COLS
+            },
+            index=df.index,
+        )
+
+        bad_cmp = num["cmp"].isna()
+        if bad_cmp.any():
+            logging.warning(
+                "Skipping %d record(s) with missing/invalid CMP in fundamentals: %s",
+                int(bad_cmp.sum()),
+                ", ".join(symbol[bad_cmp]),
+            )
+            keep = ~bad_cmp
+            df, symbol, num = df[keep], symbol[keep], num[keep]
+
+        fyers_symbol = text_col("fyers_symbol")
+        yf_symbol = text_col("yf_symbol")
+
+        # Infer exchange if not explicitly present
+        fy_upper = fyers_symbol.str.upper()
+        yf_upper = yf_symbol.str.upper()
+        inferred = np.select(
+            [
+                fy_upper.str.startswith("NSE:"),
+                fy_upper.str.startswith("BSE:"),
+                yf_upper.str.endswith(".NS"),
+                yf_upper.str.endswith(".BO"),
+            ],
+            ["NSE", "BSE", "NSE", "BSE"],
+            default="NSE",
+        )
+        exchange = text_col("exchange").str.upper()
+        exchange = exchange.where(exchange != "", pd.Series(inferred, index=df.index))
+
+        out = pd.DataFrame(
+            {
+                "symbol": symbol,
+                "name": text_col("name"),
+                "yf_symbol": yf_symbol,
+                "fyers_symbol": fyers_symbol,
+                "exchange": exchange.astype("category"),
+            }
+        )
+        return pd.concat([out, num], axis=1).reset_index(drop=True)
+
+    def _read_frame(self) -> pd.DataFrame:
+        """
+        Normalized fundamentals, served from a Parquet sidecar next to the CSV
+        while it is at least as new as the CSV and has CACHE_VERSION; rebuilt
+        from the CSV otherwise.
+        """
+        cache = self._cache_path
+        try:
+            if cache.stat().st_mtime_ns >= self._path.stat().st_mtime_ns:
+                df = read_parquet_cache(cache, CACHE_VERSION)
+                if df is not None:
+                    return df
+                logging.info("Rebuilding outdated fundamentals cache %s.", cache)
+        except FileNotFoundError:
+            pass
+        except Exception as exc:
+            logging.warning("Ignoring unreadable fundamentals cache %s (%s).", cache, exc)
+
+        df = self._normalize(read_csv(self._path, dtype=TEXT_DTYPES))
+        try:
+            write_parquet_cache(cache, df, CACHE_VERSION)
+        except Exception as exc:
+            logging.warning("Could not write fundamentals cache %s (%s).", cache, exc)
+        return df
+
+    @staticmethod
+    def _to_records(df: pd.DataFrame) -> List[FundamentalRecord]:
+        # Object columns so missing values come out as None, not NaN.
+        num = df[list(NUMERIC_COLS)]
+        num = num.astype(object).where(num.notna(), None)
+        fyers_opt = df["fyers_symbol"].astype(object).where(df["fyers_symbol"] != "", None)
+        yf_opt = df["yf_symbol"].astype(object).where(df["yf_symbol"] != "", None)
+
+        return [
+            FundamentalRecord(
+                symbol=sym,
+                name=nm,
+                cmp=float(vals[0]),
+                pe=vals[1],
+                mar_cap_cr=vals[2],
+                div_yld_pct=vals[3],
+                np_qtr_cr=vals[4],
+                qtr_profit_var_pct=vals[5],
+                sales_qtr_cr=vals[6],
+                qtr_sales_var_pct=vals[7],
+                roce_pct=vals[8],
+                debt_eq=vals[9],
+                yf_symbol=yf,
+                fyers_symbol=fy,
+                exchange=exch,
+            )
+            for sym, nm, yf, fy, exch, *vals in zip(
+                df["symbol"], df["name"], yf_opt, fyers_opt, df["exchange"].astype(str),
+                *(num[col] for col in NUMERIC_COLS),
+            )
+        ]
+
+    def _refresh(self) -> None:
+        """
+        (Re)read the normalized frame unless the CSV's mtime is unchanged since
+        the last read. Records are rebuilt lazily after a re-read.
+        """
+        try:
+            mtime_ns = self._path.stat().st_mtime_ns
+        except FileNotFoundError:
             raise FileNotFoundError(
                 f"Fundamentals file not found: {self._path}. "
                 f"Expected columns: symbol,name,cmp,pe,mar_cap_cr,div_yld_pct,"
                 f"np_qtr_cr,qtr_profit_var_pct,sales_qtr_cr,qtr_sales_var_pct,"
                 f"roce_pct,debt_eq,yf_symbol,fyers_symbol"
-            )
+            ) from None
 
-        df = pd.read_csv(self._path)
-
-        def safe_float(v):
-            try:
-                if v == "" or v is None:
-                    return None
-                return float(v)
-            except Exception:
-                return None
-
-        records: List[FundamentalRecord] = []
-
-        for _, row in df.iterrows():
-            symbol = str(row.get("symbol", "")).strip().upper()
-            if not symbol:
-                continue
-
-            name = str(row.get("name", "")).strip()
-            cmp_val = safe_float(row.get("cmp"))
-            if cmp_val is None:
-                logging.warning(
-                    "Skipping %s because CMP is missing/invalid in fundamentals.", symbol
-                )
-                continue
-
-            fyers_symbol = str(row.get("fyers_symbol") or "").strip() or None
-            yf_symbol = str(row.get("yf_symbol") or "").strip() or None
-
-            # Infer exchange if not explicitly present
-            exchange = str(row.get("exchange") or "").strip().upper()
-            if not exchange:
-                if fyers_symbol and fyers_symbol.upper().startswith("NSE:"):
-                    exchange = "NSE"
-                elif fyers_symbol and fyers_symbol.upper().startswith("BSE:"):
-                    exchange = "BSE"
-                elif yf_symbol:
-                    if yf_symbol.upper().endswith(".NS"):
-                        exchange = "NSE"
-                    elif yf_symbol.upper().endswith(".BO"):
-                        exchange = "BSE"
-                if not exchange:
-                    exchange = "NSE"
-
-            rec = FundamentalRecord(
-                symbol=symbol,
-                name=name,
-                cmp=cmp_val,
-                pe=safe_float(row.get("pe")),
-                mar_cap_cr=safe_float(row.get("mar_cap_cr")),
-                div_yld_pct=safe_float(row.get("div_yld_pct")),
-                np_qtr_cr=safe_float(row.get("np_qtr_cr")),
-                qtr_profit_var_pct=safe_float(row.get("qtr_profit_var_pct")),
-                sales_qtr_cr=safe_float(row.get("sales_qtr_cr")),
-                qtr_sales_var_pct=safe_float(row.get("qtr_sales_var_pct")),
-                roce_pct=safe_float(row.get("roce_pct")),
-                debt_eq=safe_float(row.get("debt_eq")),
-                yf_symbol=yf_symbol,
-                fyers_symbol=fyers_symbol,
-                exchange=exchange,
-            )
-            records.append(rec)
+        if self._df is not None and mtime_ns == self._loaded_mtime_ns:
+            return
 
-        self._records = {r.symbol: r for r in records}
-        logging.info("Loaded %d fundamental records from %s", len(records), self._path)
-        return records
+        self._df = self._read_frame()
+        self._records = {}
+        self._loaded_mtime_ns = mtime_ns
+        logging.info("Loaded %d fundamental records from %s", len(self._df), self._path)
 
-    def get_all(self) -> List[FundamentalRecord]:
+    def get_frame(self) -> pd.DataFrame:
+        """
+        Normalized fundamentals as columns: symbol, name, yf_symbol, fyers_symbol,
+        exchange (category) and NUMERIC_COLS (float, NaN when missing).
+        The frame is shared; copy it before mutating.
+        """
+        self._refresh()
+        return self._df
+
+    def load(self) -> List[FundamentalRecord]:
+        self._refresh()
         if not self._records:
-            return self.load()
+            self._records = {r.symbol: r for r in self._to_records(self._df)}
         return list(self._records.values())
 
+    def get_all(self) -> List[FundamentalRecord]:
+        return self.load()
+
     def get(self, symbol: str) -> Optional[FundamentalRecord]:
         if not self._records:
             self.load()
         return self._records.get(symbol.upper())
+
+
+@lru_cache(maxsize=1)
+def get_repo(csv_path: str = str(Path("data") / "penny_fundamentals.csv")) -> FundamentalsRepository:
+    """
+    Process-wide repository for csv_path, loaded once. Later load()/get_all()
+    calls only stat the CSV and re-read it if it has changed.
+    """
+    repo = FundamentalsRepository(csv_path=csv_path)
+    repo.load()
+    return repo
@@ -1,11 +1,52 @@
 import logging
+import threading
+from collections import defaultdict
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Optional
+from typing import Dict, List, Tuple
 
+import numpy as np
 import pandas as pd
 
+from csv_io import read_csv
+
+# Stored as float32. close stays float64: it is reported unrounded
+# (last_close / SMAs) and float32 would show up there as 10.199999809...
+FLOAT32_COLS = ("open", "high", "low")
+
+# Declared up front so the parser skips type inference. Low-cardinality code
+# columns are dictionary-encoded on read.
+EOD_DTYPES = {
+    "exchange": "category",
+    "symbol": "category",
+    "series": "category",
+    **{col: "float32" for col in FLOAT32_COLS},
+    "close": "float64",
+    "volume": "float64",
+}
+
+# Files larger than this are streamed in CHUNK_ROWS pieces by _load().
+CHUNKED_LOAD_BYTES = 200 * 1024 * 1024
+CHUNK_ROWS = 500_000
+
+HISTORY_COLS = ["date", "open", "high", "low", "close", "volume"]
+
+
+def _upper_categorical(values: pd.Series) -> pd.Categorical:
+    """
+    Strip/uppercase a code column by rewriting its categories, not its rows.
+
+    Categories that collide after normalization ('nse' / 'NSE') are merged by
+    remapping the integer codes.
+    """
+    cat = values.astype("category").cat
+    normalized = cat.categories.astype(str).str.strip().str.upper()
+    categories = normalized.unique()
+    # Trailing -1 so missing values (code -1) stay missing.
+    remap = np.append(categories.get_indexer(normalized), -1)
+    return pd.Categorical.from_codes(remap[cat.codes.to_numpy()], categories=categories)
+
 
 @dataclass
 class PriceHistory:
@@ -33,6 +74,14 @@ class PriceDataSource:
         """
         raise NotImplementedError
 
+    def preload_all(self) -> int:
+        """
+        Optional hook to load everything up front, before a batch of
+        get_history() calls. Returns the number of symbols loaded; sources
+        without a bulk load do nothing and return 0.
+        """
+        return 0
+
 
 class NseBseEodCsvPriceDataSource(PriceDataSource):
     """
@@ -48,26 +97,15 @@ class NseBseEodCsvPriceDataSource(PriceDataSource):
 
     def __init__(self, csv_path: Path | str = Path("data") / "eod_prices.csv") -> None:
         self._path = Path(csv_path)
-        self._df: Optional[pd.DataFrame] = None
-
-    def _load(self) -> pd.DataFrame:
-        if self._df is not None:
-            return self._df
-
-        if not self._path.exists():
-            logging.warning(
-                "EOD prices file %s not found. Scanner will skip technicals.",
-                self._path,
-            )
-            self._df = pd.DataFrame()
-            return self._df
-
-        df = pd.read_csv(self._path)
-        if "date" not in df.columns:
-            raise ValueError(
-                f"EOD prices file {self._path} must contain a 'date' column."
-            )
+        self._loaded = False
+        self._load_lock = threading.Lock()
+        # (EXCHANGE, SYMBOL) -> date-sorted history, built once in _load().
+        self._groups: Dict[Tuple[str, str], pd.DataFrame] = {}
+        # Same keys -> contiguous sorted dates, for bisecting lookback cutoffs.
+        self._dates: Dict[Tuple[str, str], np.ndarray] = {}
 
+    def _prepare(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Normalize column names and codes of a raw EOD frame (or chunk)."""
         df["date"] = pd.to_datetime(df["date"])
         # Normalize column names
         rename_map = {}
@@ -85,11 +123,115 @@ class NseBseEodCsvPriceDataSource(PriceDataSource):
                 f"EOD prices file {self._path} is missing required column(s): {missing}"
             )
 
-        self._df = df
+        df["exchange"] = _upper_categorical(df["exchange"])
+        df["symbol"] = _upper_categorical(df["symbol"])
+        for col in FLOAT32_COLS:
+            if col in df.columns:
+                df[col] = pd.to_numeric(df[col], errors="coerce").astype("float32")
+        if "volume" in df.columns:
+            volume = pd.to_numeric(df["volume"], errors="coerce")
+            if volume.notna().all():
+                with np.errstate(invalid="ignore"):
+                    volume = pd.to_numeric(volume, downcast="integer")
+            df["volume"] = volume
+        # Ensure required columns exist
+        for col in HISTORY_COLS:
+            if col not in df.columns:
+                df[col] = pd.NA
+        return df
+
+    @staticmethod
+    def _split(df: pd.DataFrame):
+        return df.groupby(["exchange", "symbol"], sort=False, observed=True)
+
+    def _load_all(self) -> int:
+        df = self._prepare(read_csv(self._path, parse_dates=["date"], dtype=EOD_DTYPES))
+        if logging.getLogger().isEnabledFor(logging.DEBUG):
+            logging.debug(
+                "EOD prices frame uses %.1f MiB.",
+                df.memory_usage(deep=True).sum() / 2**20,
+            )
+        self._groups = {
+            key: group[HISTORY_COLS].sort_values("date").reset_index(drop=True)
+            for key, group in self._split(df)
+        }
+        return len(df)
+
+    def _load_chunked(self) -> int:
+        """
+        Stream the file in CHUNK_ROWS pieces so peak memory stays bounded;
+        per-symbol pieces are concatenated and sorted once at the end.
+        """
+        parts: Dict[Tuple[str, str], List[pd.DataFrame]] = defaultdict(list)
+        rows = 0
+        chunks = pd.read_csv(
+            self._path,
+            chunksize=CHUNK_ROWS,
+            parse_dates=["date"],
+            dtype=EOD_DTYPES,
+        )
+        for chunk in chunks:
+            for key, group in self._split(self._prepare(chunk)):
+                parts[key].append(group[HISTORY_COLS])
+            rows += len(chunk)
+
+        self._groups = {
+            key: pd.concat(pieces, ignore_index=True)
+            .sort_values("date")
+            .reset_index(drop=True)
+            for key, pieces in parts.items()
+        }
+        return rows
+
+    def _load(self) -> Dict[Tuple[str, str], pd.DataFrame]:
+        if self._loaded:
+            return self._groups
+        # Scanner threads may all ask for history at once; load only once.
+        with self._load_lock:
+            if not self._loaded:
+                self._load_unlocked()
+        return self._groups
+
+    def _load_unlocked(self) -> None:
+        try:
+            size = self._path.stat().st_size
+        except FileNotFoundError:
+            logging.warning(
+                "EOD prices file %s not found. Scanner will skip technicals.",
+                self._path,
+            )
+            self._loaded = True
+            return
+
+        # Check the header first so a missing 'date' column gets a clear error
+        # rather than a parse_dates failure.
+        if "date" not in pd.read_csv(self._path, nrows=0).columns:
+            raise ValueError(
+                f"EOD prices file {self._path} must contain a 'date' column."
+            )
+
+        if size > CHUNKED_LOAD_BYTES:
+            rows = self._load_chunked()
+        else:
+            rows = self._load_all()
+        self._dates = {
+            key: group["date"].to_numpy(dtype="datetime64[ns]")
+            for key, group in self._groups.items()
+        }
+        self._loaded = True
         logging.info(
-            "Loaded EOD prices from %s with %d rows.", self._path, len(self._df)
+            "Loaded EOD prices from %s with %d rows (%d symbols).",
+            self._path,
+            rows,
+            len(self._groups),
         )
-        return self._df
+
+    def preload_all(self) -> int:
+        """
+        Parse the EOD file and build the per-symbol index now rather than on
+        the first get_history() call. Returns the number of symbols indexed.
+        """
+        return len(self._load())
 
     def get_history(
         self,
@@ -97,36 +239,26 @@ class NseBseEodCsvPriceDataSource(PriceDataSource):
         symbol: str,
         lookback_days: int = 250,
     ) -> PriceHistory:
-        df = self._load()
-        if df.empty:
+        groups = self._load()
+        if not groups:
             return PriceHistory(pd.DataFrame())
 
         exchange = str(exchange).strip().upper()
         symbol = str(symbol).strip().upper()
 
-        mask = (
-            df["exchange"].astype(str).str.upper().eq(exchange)
-            & df["symbol"].astype(str).str.upper().eq(symbol)
-        )
-        hist = df.loc[mask].copy()
-        if hist.empty:
+        key = (exchange, symbol)
+        hist = groups.get(key)
+        if hist is None or hist.empty:
             logging.warning(
                 "No EOD data found in %s for %s:%s", self._path, exchange, symbol
             )
             return PriceHistory(pd.DataFrame())
 
-        hist = hist.sort_values("date")
         if lookback_days is not None and lookback_days > 0:
             cutoff = datetime.now().date() - timedelta(days=lookback_days)
-            hist = hist[hist["date"] >= pd.Timestamp(cutoff)]
-
-        # Ensure required columns exist
-        for col in ("open", "high", "low", "close", "volume"):
-            if col not in hist.columns:
-                hist[col] = pd.NA
+            start = np.searchsorted(self._dates[key], np.datetime64(cutoff, "ns"))
+            if start:
+                hist = hist.iloc[start:].reset_index(drop=True)
 
-        return PriceHistory(
-            df=hist[["date", "open", "high", "low", "close", "volume"]].reset_index(
-                drop=True
-            )
-        )
+        # Backed by the cached group; callers treat histories as read-only.
+        return PriceHistory(df=hist)
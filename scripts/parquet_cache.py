@@ -0,0 +1,36 @@
+from pathlib import Path
+from typing import Optional
+
+import pandas as pd
+
+# Parquet key-value metadata entry holding the cache format version.
+VERSION_KEY = b"algotrade.cache_version"
+
+
+def read_parquet_cache(path: Path | str, version: str) -> Optional[pd.DataFrame]:
+    """
+    Frame written by write_parquet_cache() with the same version; None when
+    the file carries another (or no) version, i.e. it must be rebuilt.
+
+    FileNotFoundError and read errors propagate to the caller.
+    """
+    import pyarrow.parquet as pq
+
+    metadata = pq.read_schema(path).metadata or {}
+    if metadata.get(VERSION_KEY) != version.encode():
+        return None
+    return pq.read_table(path).to_pandas()
+
+
+def write_parquet_cache(
+    path: Path | str, df: pd.DataFrame, version: str, index: bool = False
+) -> None:
+    """Write df as zstd Parquet, tagged with version for read_parquet_cache()."""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    table = pa.Table.from_pandas(df, preserve_index=index)
+    table = table.replace_schema_metadata(
+        {**(table.schema.metadata or {}), VERSION_KEY: version.encode()}
+    )
+    pq.write_table(table, path, compression="zstd")
@@ -1,14 +1,47 @@
+import csv
+import json
 import logging
 import os
+import shutil
+import tempfile
 from dataclasses import dataclass
 from datetime import datetime, date, time
 from pathlib import Path
 from typing import List
 
+import numpy as np
 import pandas as pd
 from fyers_apiv3 import fyersModel
 from zoneinfo import ZoneInfo
 
+from csv_io import read_csv
+
+RECO_DTYPES = {col: str for col in ("symbol", "fyers_symbol", "exchange", "name")}
+EXECUTED_DTYPES = {"symbol": "category", "status": "category"}
+
+# NSE/BSE cash-market session
+_IST = ZoneInfo("Asia/Kolkata")
+_MARKET_OPEN = time(9, 15)   # 09:15 IST
+_MARKET_CLOSE = time(15, 30)  # 15:30 IST
+
+# Executed-log statuses that count as a placed trade
+_OK = frozenset({"ok", "success", "filled", "completed"})
+
+
+def _in_market_hours() -> bool:
+    """True during NSE/BSE cash-market hours; logs the skip otherwise."""
+    now_ist = datetime.now(_IST).time()
+    if _MARKET_OPEN <= now_ist <= _MARKET_CLOSE:
+        return True
+    logging.info(
+        "Outside NSE cash-market hours (%s–%s IST); skipping auto-trades. "
+        "Current IST time: %s",
+        _MARKET_OPEN,
+        _MARKET_CLOSE,
+        now_ist,
+    )
+    return False
+
 
 @dataclass
 class TradeInstruction:
@@ -84,7 +117,7 @@ class PennyAutoTrader:
 
     def _load_executed_today(self) -> pd.DataFrame:
         """
-        Load trades executed today (if any).
+        Load successful trades executed today (if any), with uppercased symbols.
 
         Guard against legacy/incorrect schemas where 'symbol' or 'executed_date'
         columns might be missing by returning an empty DataFrame. This prevents
@@ -93,7 +126,7 @@ class PennyAutoTrader:
         if not self._exec_path.exists():
             return pd.DataFrame(columns=["symbol", "executed_date", "status"])
 
-        df = pd.read_csv(self._exec_path)
+        df = read_csv(self._exec_path, dtype=EXECUTED_DTYPES)
 
         required_cols = {"symbol", "executed_date", "status"}
         if not required_cols.issubset(df.columns):
@@ -106,9 +139,14 @@ class PennyAutoTrader:
             # Return empty with proper columns so downstream code is safe
             return pd.DataFrame(columns=list(required_cols))
 
-        df["executed_date"] = pd.to_datetime(df["executed_date"]).dt.date
-        today = date.today()
-        return df[df["executed_date"] == today]
+        # Stay in datetime64; unparseable dates become NaT and never match today.
+        df["executed_date"] = pd.to_datetime(df["executed_date"], errors="coerce")
+        today = pd.Timestamp(date.today())
+        # Consider only successful / filled trades as executed
+        success = df["status"].astype(str).str.lower().isin(_OK)
+        df = df[(df["executed_date"].dt.normalize() == today) & success].copy()
+        df["symbol"] = df["symbol"].astype(str).str.upper()
+        return df
 
     def _append_executed(
         self, instr: TradeInstruction, resp: dict, status: str
@@ -122,124 +160,150 @@ class PennyAutoTrader:
             "qty": instr.qty,
             "price": instr.price,
             "status": status,
-            "raw_response": str(resp),
+            "raw_response": json.dumps(resp, default=str),
         }
-        df_new = pd.DataFrame([row])
-        if self._exec_path.exists():
-            try:
-                df_old = pd.read_csv(self._exec_path)
-                # Concatenate, even if df_old is empty
-                df_all = pd.concat([df_old, df_new], ignore_index=True)
-            except Exception as exc:
-                logging.warning(
-                    "Failed to read existing executed trades log %s (%s). "
-                    "Overwriting with new entry.",
-                    self._exec_path,
-                    exc,
-                )
-                df_all = df_new
-        else:
-            df_all = df_new
-
         self._exec_path.parent.mkdir(parents=True, exist_ok=True)
-        df_all.to_csv(self._exec_path, index=False)
+        try:
+            with open(self._exec_path, newline="") as f:
+                header = next(csv.reader(f), None)
+        except FileNotFoundError:
+            header = None
+
+        fieldnames = header or list(row)
+        missing = [col for col in row if col not in fieldnames]
+        if missing:
+            # Widen the log to the union of columns rather than drop fields.
+            logging.info(
+                "Adding column(s) %s to executed trades log %s.",
+                ", ".join(missing),
+                self._exec_path,
+            )
+            fieldnames = fieldnames + missing
+            self._rewrite_executed_header(fieldnames)
 
-    @staticmethod
-    def _is_success(row) -> bool:
-        status = str(row.get("status", "")).lower()
-        # Consider only successful / filled trades as executed
-        return status in ("ok", "success", "filled", "completed")
+        with open(self._exec_path, "a", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=fieldnames, restval="")
+            if not header:
+                writer.writeheader()
+            writer.writerow(row)
+
+    def _rewrite_executed_header(self, fieldnames: List[str]) -> None:
+        """
+        Atomically rewrite the executed log under fieldnames; existing rows keep
+        their values, with the added trailing columns left blank.
+        """
+        with open(self._exec_path, newline="") as src:
+            rows = list(csv.reader(src))[1:]
+
+        fd, tmp_name = tempfile.mkstemp(
+            dir=self._exec_path.parent, prefix=f".{self._exec_path.name}.", suffix=".tmp"
+        )
+        try:
+            with os.fdopen(fd, "w", newline="") as dst:
+                writer = csv.writer(dst)
+                writer.writerow(fieldnames)
+                writer.writerows(r + [""] * (len(fieldnames) - len(r)) for r in rows)
+                dst.flush()
+                os.fsync(dst.fileno())
+            shutil.copymode(self._exec_path, tmp_name)
+            os.replace(tmp_name, self._exec_path)
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
 
     def _build_instructions(self) -> List[TradeInstruction]:
         if not self._reco_path.exists():
             logging.warning("Recommendations file %s not found.", self._reco_path)
             return []
 
-        df = pd.read_csv(self._reco_path)
+        df = read_csv(self._reco_path, dtype=RECO_DTYPES)
         if df.empty:
             logging.warning("Recommendations file is empty.")
             return []
 
         df_executed_today = self._load_executed_today()
 
-        if not df_executed_today.empty and "symbol" in df_executed_today.columns:
-            already = {
-                str(row["symbol"]).upper()
-                for _, row in df_executed_today.iterrows()
-                if self._is_success(row)
-            }
-        else:
-            already = set()
-
-        instrs: List[TradeInstruction] = []
-        for _, row in df.iterrows():
-            symbol = str(row["symbol"]).upper()
-            if symbol in already:
-                logging.info(
-                    "Trade for %s already executed today; skipping.", symbol
-                )
-                continue
+        already = set(df_executed_today["symbol"].tolist())
+
+        def num(col: str) -> pd.Series:
+            if col not in df.columns:
+                return pd.Series(np.nan, index=df.index)
+            return pd.to_numeric(df[col], errors="coerce")
+
+        def text(col: str) -> pd.Series:
+            if col not in df.columns:
+                return pd.Series("", index=df.index, dtype=object)
+            return df[col].fillna("").astype(str).str.strip()
+
+        # Derive every column on the full frame first, then filter.
+        df["symbol"] = df["symbol"].astype(str).str.upper()
+        df["fyers_symbol"] = text("fyers_symbol")
+        df["exchange"] = text("exchange")
+        df["name"] = text("name")
+        df["qty"] = num("qty").fillna(0).astype(int)
+
+        # A zero/blank entry falls back to CMP, as `entry or cmp` did per row.
+        entry = num("recommended_entry")
+        df["price"] = entry.where(entry != 0).fillna(num("cmp")).fillna(0.0)
+
+        def level_or(col: str, factor: float) -> pd.Series:
+            v = num(col)
+            return v.where(v.notna() & (v != 0), df["price"] * factor)
+
+        df["stop_loss"] = level_or("stop_loss", 0.8)
+        df["target1"] = level_or("target1", 1.12)
+        df["target2"] = level_or("target2", 1.25)
+
+        def drop(mask: pd.Series, msg: str, cols=("symbol",), level=logging.WARNING) -> None:
+            nonlocal df
+            for args in df.loc[mask, list(cols)].itertuples(index=False, name=None):
+                logging.log(level, msg, *args)
+            df = df[~mask]
+
+        drop(
+            df["symbol"].isin(already),
+            "Trade for %s already executed today; skipping.",
+            level=logging.INFO,
+        )
+        drop(df["fyers_symbol"] == "", "No fyers_symbol for %s; skipping auto-trade.")
+        drop(df["qty"] <= 0, "Non-positive qty for %s; skipping auto-trade.")
+        drop(
+            df["price"] <= 0,
+            "Non-positive price %.2f for %s; skipping auto-trade.",
+            cols=("price", "symbol"),
+        )
+        # Only trade stocks with price strictly between 100 and 500
+        drop(
+            ~((df["price"] > 100) & (df["price"] < 500)),
+            "Price %.2f for %s is outside range 100–500; skipping.",
+            cols=("price", "symbol"),
+            level=logging.INFO,
+        )
 
-            fyers_symbol = str(row.get("fyers_symbol") or "").strip()
-            if not fyers_symbol:
-                logging.warning(
-                    "No fyers_symbol for %s; skipping auto-trade.", symbol
-                )
-                continue
-
-            qty = int(row.get("qty") or 0)
-            if qty <= 0:
-                logging.warning("Non-positive qty for %s; skipping auto-trade.", symbol)
-                continue
-
-            price = float(row.get("recommended_entry") or row.get("cmp") or 0.0)
-            if price <= 0:
-                logging.warning("Non-positive price %.2f for %s; skipping auto-trade.", price, symbol)
-                continue
-
-            # Only trade stocks with price strictly between 100 and 500
-            if not (100 < price < 500):
-                logging.info(
-                    "Price %.2f for %s is outside range 100–500; skipping.",
-                    price,
-                    symbol,
-                )
-                continue
-
-            stop_loss = float(row.get("stop_loss") or price * 0.8)
-            target1 = float(row.get("target1") or price * 1.12)
-            target2 = float(row.get("target2") or price * 1.25)
-
-            instrs.append(
-                TradeInstruction(
-                    symbol=symbol,
-                    fyers_symbol=fyers_symbol,
-                    exchange=str(row.get("exchange") or ""),
-                    name=str(row.get("name") or ""),
-                    side="BUY",
-                    qty=qty,
-                    price=price,
-                    stop_loss=stop_loss,
-                    target1=target1,
-                    target2=target2,
-                )
+        cols = [
+            "symbol", "fyers_symbol", "exchange", "name", "qty",
+            "price", "stop_loss", "target1", "target2",
+        ]
+        return [
+            TradeInstruction(
+                symbol=symbol,
+                fyers_symbol=fyers_symbol,
+                exchange=exchange,
+                name=name,
+                side="BUY",
+                qty=int(qty),
+                price=float(price),
+                stop_loss=float(stop_loss),
+                target1=float(target1),
+                target2=float(target2),
             )
-        return instrs
+            for symbol, fyers_symbol, exchange, name, qty, price, stop_loss, target1, target2
+            in df[cols].itertuples(index=False, name=None)
+        ]
 
     def run_once(self) -> None:
         # Time-window guard: only trade during NSE/BSE cash market hours
-        now_ist = datetime.now(ZoneInfo("Asia/Kolkata")).time()
-        market_open = time(9, 15)   # 09:15 IST
-        market_close = time(15, 30)  # 15:30 IST
-
-        if not (market_open <= now_ist <= market_close):
-            logging.info(
-                "Outside NSE cash-market hours (%s–%s IST); skipping auto-trades. "
-                "Current IST time: %s",
-                market_open,
-                market_close,
-                now_ist,
-            )
+        if not _in_market_hours():
             return
 
         logging.info("Loading penny recommendations from %s", self._reco_path)
@@ -276,6 +340,9 @@ def main() -> None:
         format="%(asctime)s [%(levelname)s] %(message)s",
     )
     logging.info("Starting penny auto-trader (SOLID, FYERS execution only)...")
+    # Checked before building the FYERS client or reading any file.
+    if not _in_market_hours():
+        return
 
     client_id = os.getenv("FYERS_CLIENT_ID", "")
     access_token = os.getenv("FYERS_ACCESS_TOKEN", "")
@@ -1,11 +1,11 @@
 import logging
-import math
 import os
 import time
 from datetime import datetime
 from pathlib import Path
 from typing import Optional
 
+import numpy as np
 import pandas as pd
 
 from penny_scanner import scan_penny_universe
@@ -35,71 +35,76 @@ def _build_recommendations(
     df = df.sort_values("total_score", ascending=False).head(top_n).reset_index(drop=True)
 
     max_risk_per_trade = total_capital * max_risk_pct
-    recs = []
-
-    for _, row in df.iterrows():
-        symbol = row["symbol"]
-        name = row["name"]
-        cmp_val = float(row["cmp"])
-        entry = float(row.get("last_close") or cmp_val)
-        entry_low = float(row.get("entry_low") or entry * 0.95)
-        entry_high = float(row.get("entry_high") or entry * 1.02)
-        stop_loss = float(row.get("stop_loss") or entry * 0.8)
-        target2 = float(row.get("target2") or entry * 1.25)
-        fyers_symbol = row["fyers_symbol"]
-
-        risk_per_share = entry - stop_loss
-        if risk_per_share <= 0:
-            logging.warning(
-                "Invalid risk_per_share for %s; skipping in recommendations.", symbol
-            )
-            continue
-
-        qty = math.floor(max_risk_per_trade / risk_per_share)
-        capital_required = qty * entry
-        if qty <= 0 or capital_required > total_capital:
-            logging.warning(
-                "Not enough capital to allocate to %s (required %.2f, total %.2f).",
-                symbol,
-                capital_required,
-                total_capital,
-            )
-            continue
-
-        risk_on_trade = qty * risk_per_share
-        rr_to_target2 = (target2 - entry) / risk_per_share if risk_per_share > 0 else 0.0
-
-        rec = {
-            "symbol": symbol,
-            "exchange": row["exchange"],
-            "name": name,
-            "fyers_symbol": fyers_symbol,
-            "cmp": cmp_val,
-            "entry_low": round(entry_low, 2),
-            "entry_high": round(entry_high, 2),
-            "recommended_entry": round(entry, 2),
-            "stop_loss": round(stop_loss, 2),
-            "target1": round(float(row.get("target1") or entry * 1.12), 2),
-            "target2": round(target2, 2),
-            "risk_per_share": round(risk_per_share, 2),
-            "qty": int(qty),
-            "capital_required": round(capital_required, 2),
-            "risk_on_trade": round(risk_on_trade, 2),
-            "rr_to_target2": round(rr_to_target2, 2),
-            "fundamental_score": float(row["fundamental_score"]),
-            "technical_score": float(row["technical_score"]),
-            "total_score": float(row["total_score"]),
-            "risk_flag": row["risk_flag"],
-            "trend_label": row["trend_label"],
-            "recommendation_time": datetime.now().isoformat(timespec="seconds"),
-        }
-        recs.append(rec)
 
-    if not recs:
+    def num(col: str) -> pd.Series:
+        if col not in df.columns:
+            return pd.Series(np.nan, index=df.index)
+        return pd.to_numeric(df[col], errors="coerce")
+
+    def level_or(col: str, base: pd.Series, factor: float) -> pd.Series:
+        # Same as `row.get(col) or base * factor`: blank/zero falls back.
+        v = num(col)
+        return v.where(v.notna() & (v != 0), base * factor)
+
+    cmp_val = num("cmp")
+    entry = level_or("last_close", cmp_val, 1.0)
+    entry_low = level_or("entry_low", entry, 0.95)
+    entry_high = level_or("entry_high", entry, 1.02)
+    stop_loss = level_or("stop_loss", entry, 0.8)
+    target1 = level_or("target1", entry, 1.12)
+    target2 = level_or("target2", entry, 1.25)
+
+    risk_per_share = entry - stop_loss
+    bad_risk = ~(risk_per_share > 0)
+    for symbol in df.loc[bad_risk, "symbol"]:
+        logging.warning(
+            "Invalid risk_per_share for %s; skipping in recommendations.", symbol
+        )
+
+    safe_risk = risk_per_share.where(~bad_risk)
+    qty = np.floor(max_risk_per_trade / safe_risk).fillna(0).astype(int)
+    capital_required = qty * entry
+    no_capital = ~bad_risk & ((qty <= 0) | (capital_required > total_capital))
+    for symbol, required in zip(df.loc[no_capital, "symbol"], capital_required[no_capital]):
+        logging.warning(
+            "Not enough capital to allocate to %s (required %.2f, total %.2f).",
+            symbol,
+            required,
+            total_capital,
+        )
+
+    keep = ~(bad_risk | no_capital)
+    if not keep.any():
         logging.warning("No recommendations created.")
         return pd.DataFrame()
 
-    return pd.DataFrame(recs)
+    rec = pd.DataFrame(
+        {
+            "symbol": df["symbol"],
+            "exchange": df["exchange"],
+            "name": df["name"],
+            "fyers_symbol": df["fyers_symbol"],
+            "cmp": cmp_val,
+            "entry_low": entry_low.round(2),
+            "entry_high": entry_high.round(2),
+            "recommended_entry": entry.round(2),
+            "stop_loss": stop_loss.round(2),
+            "target1": target1.round(2),
+            "target2": target2.round(2),
+            "risk_per_share": risk_per_share.round(2),
+            "qty": qty,
+            "capital_required": capital_required.round(2),
+            "risk_on_trade": (qty * risk_per_share).round(2),
+            "rr_to_target2": ((target2 - entry) / safe_risk).fillna(0.0).round(2),
+            "fundamental_score": df["fundamental_score"].astype(float),
+            "technical_score": df["technical_score"].astype(float),
+            "total_score": df["total_score"].astype(float),
+            "risk_flag": df["risk_flag"],
+            "trend_label": df["trend_label"],
+            "recommendation_time": datetime.now().isoformat(timespec="seconds"),
+        }
+    )
+    return rec[keep].reset_index(drop=True)
 
 
 def run_once() -> Optional[pd.DataFrame]:
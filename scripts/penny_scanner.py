@@ -1,13 +1,15 @@
 import logging
-from dataclasses import asdict, dataclass
+import os
+from dataclasses import dataclass, fields
 from pathlib import Path
-from typing import List, Optional
+from typing import Dict, Optional, Sequence
 
+import numpy as np
 import pandas as pd
 
-from fundamentals import FundamentalRecord, FundamentalsRepository
+from fundamentals import FundamentalRecord, FundamentalsRepository, get_repo
 from market_data import NseBseEodCsvPriceDataSource
-from technical_analysis import TechnicalAnalysisService, TechnicalSnapshot
+from technical_analysis import TechnicalAnalysisService, TechnicalSnapshot, TrendCode
 
 
 @dataclass
@@ -52,6 +54,33 @@ class PennyCandidate:
     risk_per_share: Optional[float]
 
 
+# Technical score contribution of each TrendCode.
+TREND_SCORE = {
+    TrendCode.STRONG_UP: 4.0,
+    TrendCode.UP: 2.5,
+    TrendCode.UP_SHORT_TERM: 2.5,
+    TrendCode.DOWN_SHORT_TERM: -2.0,
+    TrendCode.DOWN: -2.0,
+    TrendCode.STRONG_DOWN: -2.0,
+}
+
+# Report column order; PennyCandidate documents the schema.
+CANDIDATE_COLUMNS = [f.name for f in fields(PennyCandidate)]
+
+# Scores and swing levels are reported to 2 decimals.
+ROUNDED_COLUMNS = [
+    "fundamental_score",
+    "technical_score",
+    "total_score",
+    "entry_low",
+    "entry_high",
+    "stop_loss",
+    "target1",
+    "target2",
+    "risk_per_share",
+]
+
+
 class PennyFundamentalFilter:
     """
     SRP: encapsulates 'fundamentally strong penny' criteria and scoring.
@@ -77,62 +106,47 @@ class PennyFundamentalFilter:
     def _safe(v: Optional[float], default: float = 0.0) -> float:
         return float(v) if v is not None else default
 
+    @staticmethod
+    def _column(records: Sequence[FundamentalRecord], attr: str) -> np.ndarray:
+        """One attribute across records as float64, None -> NaN."""
+        return np.array([getattr(r, attr) for r in records], dtype="float64")
+
+    def score_batch(self, records: Sequence[FundamentalRecord]) -> np.ndarray:
+        """
+        score() for every record at once: a float64 array aligned with records,
+        NaN where score() would return None. Missing values (NaN) never satisfy
+        a band, so they score 0 there, and fail the mandatory ROCE/debt checks.
+        """
+        cmp = self._column(records, "cmp")
+        pe = self._column(records, "pe")
+        roce = self._column(records, "roce_pct")
+        debt = self._column(records, "debt_eq")
+        qprof = self._column(records, "qtr_profit_var_pct")
+        qsales = self._column(records, "qtr_sales_var_pct")
+
+        with np.errstate(invalid="ignore"):
+            # Must be a penny stock, with mandatory low debt and minimum profitability
+            valid = (cmp <= self.max_price) & (roce >= self.min_roce) & (debt <= self.max_debt_eq)
+
+            # PE band scoring
+            score = np.select(
+                [(pe >= 10) & (pe <= 30), ((pe >= 6) & (pe < 10)) | ((pe > 30) & (pe <= 45))],
+                [3.0, 1.5],
+                default=0.0,
+            )
+            # ROCE strength
+            score += np.select([roce >= 25, roce >= 18, roce >= self.min_roce], [4.0, 3.0, 2.0], 0.0)
+            # Debt discipline
+            score += np.select([debt <= 0.1, debt <= 0.4, debt <= self.max_debt_eq], [3.0, 2.0, 1.0], 0.0)
+            # Growth signals
+            score += np.select([qprof >= 25, qprof >= self.min_qtr_profit_growth], [2.0, 1.0], 0.0)
+            score += np.select([qsales >= 15, qsales >= self.min_qtr_sales_growth], [2.0, 1.0], 0.0)
+
+        return np.where(valid & (score >= self.min_score), score, np.nan)
+
     def score(self, rec: FundamentalRecord) -> Optional[float]:
-        # Must be a penny stock
-        if rec.cmp > self.max_price:
-            return None
-
-        pe = rec.pe
-        roce = rec.roce_pct
-        debt = rec.debt_eq
-        qprof = rec.qtr_profit_var_pct
-        qsales = rec.qtr_sales_var_pct
-
-        # Mandatory low debt and minimum profitability
-        if roce is None or roce < self.min_roce:
-            return None
-        if debt is None or debt > self.max_debt_eq:
-            return None
-
-        score = 0.0
-
-        # PE band scoring
-        if pe is not None:
-            if 10 <= pe <= 30:
-                score += 3.0
-            elif 6 <= pe < 10 or 30 < pe <= 45:
-                score += 1.5
-
-        # ROCE strength
-        if roce >= 25:
-            score += 4.0
-        elif roce >= 18:
-            score += 3.0
-        elif roce >= self.min_roce:
-            score += 2.0
-
-        # Debt discipline
-        if debt <= 0.1:
-            score += 3.0
-        elif debt <= 0.4:
-            score += 2.0
-        elif debt <= self.max_debt_eq:
-            score += 1.0
-
-        # Growth signals
-        if qprof is not None:
-            if qprof >= 25:
-                score += 2.0
-            elif qprof >= self.min_qtr_profit_growth:
-                score += 1.0
-
-        if qsales is not None:
-            if qsales >= 15:
-                score += 2.0
-            elif qsales >= self.min_qtr_sales_growth:
-                score += 1.0
-
-        return score if score >= self.min_score else None
+        s = self.score_batch([rec])[0]
+        return None if np.isnan(s) else float(s)
 
     def risk_flag(self, rec: FundamentalRecord) -> str:
         debt = self._safe(rec.debt_eq)
@@ -156,16 +170,19 @@ class PennyScannerService:
         ta_service: TechnicalAnalysisService,
         fundamental_filter: PennyFundamentalFilter,
         lookback_days: int = 250,
+        max_workers: Optional[int] = None,
     ) -> None:
         self._repo = fundamentals_repo
         self._price_source = price_source
         self._ta = ta_service
         self._ff = fundamental_filter
         self._lookback_days = lookback_days
+        self._max_workers = max_workers or os.cpu_count() or 1
 
     def _build_candidate(
         self, rec: FundamentalRecord, tech: Optional[TechnicalSnapshot], fscore: float
-    ) -> PennyCandidate:
+    ) -> Dict[str, object]:
+        """One report row, keyed by CANDIDATE_COLUMNS."""
         last_close = tech.last_close if tech else rec.cmp
         sma20 = tech.sma20 if tech else None
         sma50 = tech.sma50 if tech else None
@@ -176,12 +193,7 @@ class PennyScannerService:
         # Technical scoring
         tscore = 0.0
         if tech:
-            if trend == "Strong uptrend":
-                tscore += 4.0
-            elif trend.startswith("Uptrend"):
-                tscore += 2.5
-            elif trend.startswith("Downtrend") or "downtrend" in trend.lower():
-                tscore -= 2.0
+            tscore += TREND_SCORE.get(tech.trend_code, 0.0)
 
             if vol is not None:
                 if vol < 0.35:
@@ -201,7 +213,7 @@ class PennyScannerService:
         target2 = last_close * 1.25
         risk_per_share = last_close - stop_loss
 
-        return PennyCandidate(
+        return dict(
             symbol=rec.symbol,
             exchange=rec.exchange,
             name=rec.name,
@@ -222,49 +234,56 @@ class PennyScannerService:
             sma200=sma200,
             volatility_annual=vol,
             trend_label=trend,
-            fundamental_score=round(fscore, 2),
-            technical_score=round(tscore, 2),
-            total_score=round(total_score, 2),
+            fundamental_score=fscore,
+            technical_score=tscore,
+            total_score=total_score,
             risk_flag=self._ff.risk_flag(rec),
-            entry_low=round(entry_low, 2),
-            entry_high=round(entry_high, 2),
-            stop_loss=round(stop_loss, 2),
-            target1=round(target1, 2),
-            target2=round(target2, 2),
-            risk_per_share=round(risk_per_share, 2),
+            entry_low=entry_low,
+            entry_high=entry_high,
+            stop_loss=stop_loss,
+            target1=target1,
+            target2=target2,
+            risk_per_share=risk_per_share,
         )
 
     def scan(self) -> pd.DataFrame:
         records = self._repo.get_all()
         logging.info("Scanning %d fundamentals for penny opportunities...", len(records))
 
-        candidates: List[PennyCandidate] = []
-        for rec in records:
-            fscore = self._ff.score(rec)
-            if fscore is None:
+        passed = []
+        fscores = self._ff.score_batch(records)
+        for rec, fscore in zip(records, fscores.tolist()):
+            if np.isnan(fscore):
                 continue
-
             logging.info(
                 "--- Processing %s (%s, CMP=%.2f) ---",
                 rec.name,
                 rec.symbol,
                 rec.cmp,
             )
+            passed.append((rec, fscore))
 
-            tech = self._ta.build_snapshot(
-                exchange=rec.exchange,
-                symbol=rec.symbol,
-                lookback_days=self._lookback_days,
-            )
-
-            cand = self._build_candidate(rec, tech, fscore)
-            candidates.append(cand)
-
-        if not candidates:
+        if not passed:
             logging.warning("No penny candidates found with current criteria.")
             return pd.DataFrame()
 
-        df = pd.DataFrame([asdict(c) for c in candidates])
+        # EOD prices are only parsed once something passed the fundamentals
+        # filter; technicals for all passing symbols then come in one batch.
+        self._price_source.preload_all()
+        snapshots = self._ta.build_snapshots_batch(
+            [(rec.exchange, rec.symbol) for rec, _ in passed],
+            lookback_days=self._lookback_days,
+            max_workers=self._max_workers,
+        )
+
+        # Accumulate the report column-wise and build the DataFrame once.
+        columns: Dict[str, list] = {name: [] for name in CANDIDATE_COLUMNS}
+        for (rec, fscore), tech in zip(passed, snapshots):
+            for name, value in self._build_candidate(rec, tech, fscore).items():
+                columns[name].append(value)
+
+        df = pd.DataFrame(columns)
+        df[ROUNDED_COLUMNS] = df[ROUNDED_COLUMNS].round(2)
         df = df.sort_values("total_score", ascending=False).reset_index(drop=True)
         return df
 
@@ -281,7 +300,7 @@ def scan_penny_universe(
 
     logging.info("Starting penny stock scan (SOLID + NSE/BSE EOD)...")
 
-    fundamentals_repo = FundamentalsRepository(csv_path=fundamentals_path)
+    fundamentals_repo = get_repo(str(fundamentals_path))
     price_source = NseBseEodCsvPriceDataSource(csv_path=eod_prices_path)
     ta_service = TechnicalAnalysisService(data_source=price_source)
     ffilter = PennyFundamentalFilter()
@@ -7,36 +7,55 @@ from typing import Optional
 PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.append(PROJECT_ROOT)
 
+import numpy as np
 import pandas as pd
 from core.universe import get_universe
-from core.data_feed import get_historical_ohlc
+from core.data_feed import get_historical_ohlc_batch
 from core.risk_manager import load_settings
 
 REPORT_PATH = os.path.join(PROJECT_ROOT, "data", "profitability_report.csv")
 
 
-def compute_return(latest: float, past: float) -> Optional[float]:
-    if latest is None or past is None or past == 0:
+def pct_return(closes: np.ndarray, bars_ago: int) -> Optional[float]:
+    """% change from closes[-1 - bars_ago] to closes[-1]; None if too short or base is 0."""
+    if closes.size <= bars_ago:
         return None
-    return (latest - past) / past * 100.0
-
-
-def classify_stock(day: Optional[float], week: Optional[float], month: Optional[float]) -> str:
-    d = day if day is not None else 0.0
-    w = week if week is not None else 0.0
-    m = month if month is not None else 0.0
-
-    if d > 0 and w > 0 and m > 0:
-        return "Strong uptrend (D/W/M all positive)"
-    if w > 0 and m > 0:
-        return "Uptrend (W & M positive)"
-    if m > 0 and w >= 0 and d <= 0:
-        return "Pullback in uptrend"
-    if d < 0 and w < 0 and m < 0:
-        return "Consistent downtrend"
-    if m < 0 and (d > 0 or w > 0):
-        return "Short-term bounce in downtrend"
-    return "Sideways / Choppy"
+    past = closes[-1 - bars_ago]
+    if past == 0:
+        return None
+    return float((closes[-1] - past) / past * 100.0)
+
+
+# classify_stock() codes index into this.
+RATING_LABELS = np.array(
+    [
+        "Strong uptrend (D/W/M all positive)",
+        "Uptrend (W & M positive)",
+        "Pullback in uptrend",
+        "Consistent downtrend",
+        "Short-term bounce in downtrend",
+        "Sideways / Choppy",
+    ]
+)
+
+
+def classify_stock(day: np.ndarray, week: np.ndarray, month: np.ndarray) -> np.ndarray:
+    """
+    Rating code per symbol (see RATING_LABELS) from day/week/month % returns
+    (missing returns as 0.0).
+    """
+    d, w, m = day, week, month
+    return np.select(
+        [
+            (d > 0) & (w > 0) & (m > 0),
+            (w > 0) & (m > 0),
+            (m > 0) & (w >= 0) & (d <= 0),
+            (d < 0) & (w < 0) & (m < 0),
+            (m < 0) & ((d > 0) | (w > 0)),
+        ],
+        [0, 1, 2, 3, 4],
+        default=5,
+    )
 
 
 def scan_universe():
@@ -48,23 +67,26 @@ def scan_universe():
         return
 
     rows = []
+    returns = []
 
     print(f"Scanning {len(universe)} symbols...")
+    histories = get_historical_ohlc_batch(
+        universe, days=90, timeframe=settings["strategy"]["timeframe"]
+    )
     for symbol in universe:
 
-        df = get_historical_ohlc(symbol, days=90, timeframe=settings["strategy"]["timeframe"])
+        df = histories.get(symbol, pd.DataFrame())
         if df.empty or df.shape[0] < 25:
             print(f"Skipping {symbol}: not enough data.")
             continue
 
         df = df.sort_index()
-        latest_close = df["close"].iloc[-1]
+        closes = df["close"].to_numpy(dtype="float64")
+        latest_close = float(closes[-1])
 
-        day_ret = compute_return(latest_close, df["close"].iloc[-2]) if df.shape[0] >= 2 else None
-        week_ret = compute_return(latest_close, df["close"].iloc[-6]) if df.shape[0] >= 6 else None
-        month_ret = compute_return(latest_close, df["close"].iloc[-22]) if df.shape[0] >= 22 else None
-
-        rating = classify_stock(day_ret, week_ret, month_ret)
+        day_ret = pct_return(closes, 1)
+        week_ret = pct_return(closes, 5)
+        month_ret = pct_return(closes, 21)
 
         rows.append({
             "symbol": symbol,
@@ -72,14 +94,21 @@ def scan_universe():
             "day_change_pct": round(day_ret, 2) if day_ret is not None else None,
             "week_change_pct": round(week_ret, 2) if week_ret is not None else None,
             "month_change_pct": round(month_ret, 2) if month_ret is not None else None,
-            "rating": rating
         })
+        returns.append((day_ret, week_ret, month_ret))
 
     if not rows:
         print("No data collected.")
         return
 
     df_report = pd.DataFrame(rows)
+    # Classify every symbol at once, on the unrounded returns.
+    # None -> NaN -> 0.0 in one pass per column: missing returns count as flat.
+    day_rets, week_rets, month_rets = np.nan_to_num(np.array(returns, dtype="float64").T, nan=0.0)
+    # Labels as a categorical: one codes array, same CSV text.
+    df_report["rating"] = pd.Categorical.from_codes(
+        classify_stock(day_rets, week_rets, month_rets), categories=RATING_LABELS
+    )
     df_report.sort_values(
         by=["month_change_pct", "week_change_pct", "day_change_pct"],
         ascending=[False, False, False],
@@ -1,18 +1,29 @@
 import os
 import sys
+import time
 from datetime import datetime
-from typing import Optional, Union
+from typing import Dict, List, Optional
 
 PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.append(PROJECT_ROOT)
+# scripts/ too, so sibling helpers import the same way as in the penny scripts
+# whether this runs as scripts/scan_profitability_yf.py or is imported.
+sys.path.append(os.path.join(PROJECT_ROOT, "scripts"))
 
+import numpy as np
 import pandas as pd
 import yfinance as yf
 
 from core.universe import get_universe
 from core.risk_manager import load_settings
+from parquet_cache import read_parquet_cache, write_parquet_cache
 
 REPORT_PATH = os.path.join(PROJECT_ROOT, "data", "profitability_report_yf.csv")
+CACHE_DIR = os.path.join(PROJECT_ROOT, "data", "cache")
+DEFAULT_CACHE_TTL_HOURS = 12.0
+# Stored in each cache file; bump it when the cached frame layout changes,
+# so old files are re-downloaded instead of reused.
+CACHE_VERSION = "1"
 
 
 def nse_to_yahoo(symbol: str) -> str:
@@ -27,80 +38,183 @@ def nse_to_yahoo(symbol: str) -> str:
         return symbol  # fallback
 
 
-NumberLike = Union[float, int, pd.Series, pd.Index]
-
-
-def compute_return(latest: NumberLike, past: NumberLike) -> Optional[float]:
-    if latest is None or past is None:
+def pct_return(closes: np.ndarray, bars_ago: int) -> Optional[float]:
+    """% change from closes[-1 - bars_ago] to closes[-1]; None if too short or base is 0."""
+    if closes.size <= bars_ago:
         return None
-
-    try:
-        latest_val = float(latest)
-        past_val = float(past)
-    except Exception:
+    past = closes[-1 - bars_ago]
+    if past == 0:
         return None
+    return float((closes[-1] - past) / past * 100.0)
 
-    if past_val == 0:
-        return None
 
-    return (latest_val - past_val) / past_val * 100.0
+# classify_stock() codes index into this.
+RATING_LABELS = np.array(
+    [
+        "Strong uptrend (D/W/M all positive)",
+        "Uptrend (W & M positive)",
+        "Pullback in uptrend",
+        "Consistent downtrend",
+        "Short-term bounce in downtrend",
+        "Sideways / Choppy",
+    ]
+)
+
 
+def classify_stock(day: np.ndarray, week: np.ndarray, month: np.ndarray) -> np.ndarray:
+    """
+    Rating code per symbol (see RATING_LABELS) from day/week/month % returns
+    (missing returns as 0.0).
+    """
+    d, w, m = day, week, month
+    return np.select(
+        [
+            (d > 0) & (w > 0) & (m > 0),
+            (w > 0) & (m > 0),
+            (m > 0) & (w >= 0) & (d <= 0),
+            (d < 0) & (w < 0) & (m < 0),
+            (m < 0) & ((d > 0) | (w > 0)),
+        ],
+        [0, 1, 2, 3, 4],
+        default=5,
+    )
 
-def classify_stock(day: Optional[float], week: Optional[float], month: Optional[float]) -> str:
-    d = day if day is not None else 0.0
-    w = week if week is not None else 0.0
-    m = month if month is not None else 0.0
 
-    if d > 0 and w > 0 and m > 0:
-        return "Strong uptrend (D/W/M all positive)"
-    if w > 0 and m > 0:
-        return "Uptrend (W & M positive)"
-    if m > 0 and w >= 0 and d <= 0:
-        return "Pullback in uptrend"
-    if d < 0 and w < 0 and m < 0:
-        return "Consistent downtrend"
-    if m < 0 and (d > 0 or w > 0):
-        return "Short-term bounce in downtrend"
-    return "Sideways / Choppy"
+# classify_sma_trend() codes index into these.
+SMA_TREND_LABELS = np.array(
+    [
+        "Strong SMA uptrend (P>20>50>200)",
+        "Healthy uptrend (20>50>200, P>=20)",
+        "Mild uptrend / consolidation",
+        "Strong SMA downtrend (P<20<50<200)",
+        "Mixed / Range",
+        "SMA data incomplete",
+    ]
+)
+SMA_TREND_SWING_BONUS = np.array([5.0, 3.0, 0.0, -5.0, 0.0, 0.0])
 
 
-def classify_sma_trend(price: float, sma20: float, sma50: float, sma200: float) -> str:
+def classify_sma_trend(
+    price: np.ndarray, sma20: np.ndarray, sma50: np.ndarray, sma200: np.ndarray
+) -> np.ndarray:
     """
-    Simple SMA-stack classification for swing trend.
+    Simple SMA-stack classification for swing trend: a code per symbol (see
+    SMA_TREND_LABELS). Rows with any NaN SMA are "SMA data incomplete".
     """
-    if price > sma20 > sma50 > sma200:
-        return "Strong SMA uptrend (P>20>50>200)"
-    if sma20 > sma50 > sma200 and price >= sma20:
-        return "Healthy uptrend (20>50>200, P>=20)"
-    if price >= sma50 > sma200 and sma20 >= sma50:
-        return "Mild uptrend / consolidation"
-    if price < sma20 < sma50 < sma200:
-        return "Strong SMA downtrend (P<20<50<200)"
-    return "Mixed / Range"
+    incomplete = np.isnan(sma20) | np.isnan(sma50) | np.isnan(sma200)
+    with np.errstate(invalid="ignore"):
+        conditions = [
+            incomplete,
+            (price > sma20) & (sma20 > sma50) & (sma50 > sma200),
+            (sma20 > sma50) & (sma50 > sma200) & (price >= sma20),
+            (price >= sma50) & (sma50 > sma200) & (sma20 >= sma50),
+            (price < sma20) & (sma20 < sma50) & (sma50 < sma200),
+        ]
+    return np.select(conditions, [5, 0, 1, 2, 3], default=4)
 
 
 def compute_swing_score(
-    month_ret: Optional[float],
-    week_ret: Optional[float],
-    sma_trend: str,
-) -> float:
+    month_ret: np.ndarray,
+    week_ret: np.ndarray,
+    sma_trend: np.ndarray,
+) -> np.ndarray:
     """
-    A simple numeric score to rank swing candidates.
+    A simple numeric score to rank swing candidates, per symbol
+    (missing returns as 0.0; sma_trend as classify_sma_trend codes).
     You can tune weights later.
     """
-    m = month_ret if month_ret is not None else 0.0
-    w = week_ret if week_ret is not None else 0.0
+    score = month_ret * 0.7 + week_ret * 0.3  # bias more towards 1M performance
+    return np.round(score + SMA_TREND_SWING_BONUS[sma_trend], 2)
+
+
+def _ticker_frame(data: pd.DataFrame, yf_symbol: str) -> pd.DataFrame:
+    """
+    One ticker's OHLCV from a group_by="ticker" multi-download, without the
+    all-NaN rows that pad it to the other tickers' dates.
+    """
+    if isinstance(data.columns, pd.MultiIndex):
+        if yf_symbol not in data.columns.get_level_values(0):
+            return pd.DataFrame()
+        data = data[yf_symbol]
+    return data.dropna(how="all")
+
+
+def _download(tickers: List[str], **kwargs) -> pd.DataFrame:
+    return yf.download(
+        tickers=tickers,
+        interval="1d",
+        group_by="ticker",
+        progress=False,
+        threads=True,
+        **kwargs,
+    )
+
+
+def _store_cache(yf_symbol: str, df: pd.DataFrame) -> pd.DataFrame:
+    """Keep ~6 months of bars and write them to data/cache/<yf_symbol>.parquet."""
+    if not df.empty:
+        df = df[df.index >= df.index.max() - pd.DateOffset(months=6)]
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        write_parquet_cache(
+            os.path.join(CACHE_DIR, f"{yf_symbol}.parquet"), df, CACHE_VERSION, index=True
+        )
+    except Exception as exc:
+        print(f"     Could not cache {yf_symbol}: {exc}")
+    return df
+
+
+def load_history(yf_symbols: List[str], ttl_hours: float) -> Dict[str, pd.DataFrame]:
+    """
+    ~6 months of daily OHLCV per Yahoo ticker.
+
+    Caches younger than ttl_hours are used as-is. Older caches only fetch the
+    tail from their last cached bar on (that bar is re-fetched, as it may have
+    been a partial day). Tickers without a cache, or whose cache has another
+    CACHE_VERSION, get the full 6 months. Each group is one multi-ticker request.
+    """
+    frames: Dict[str, pd.DataFrame] = {}
+    stale: Dict[str, pd.DataFrame] = {}
+    missing: List[str] = []
+    now = time.time()
+
+    for yf_symbol in sorted(set(yf_symbols)):
+        path = os.path.join(CACHE_DIR, f"{yf_symbol}.parquet")
+        try:
+            age_hours = (now - os.stat(path).st_mtime) / 3600.0
+            cached = read_parquet_cache(path, CACHE_VERSION)
+        except FileNotFoundError:
+            missing.append(yf_symbol)
+            continue
+        except Exception as exc:
+            print(f"     Ignoring unreadable cache for {yf_symbol}: {exc}")
+            missing.append(yf_symbol)
+            continue
+
+        if cached is None:
+            print(f"     Ignoring outdated cache for {yf_symbol}.")
+            missing.append(yf_symbol)
+        elif age_hours <= ttl_hours:
+            frames[yf_symbol] = cached
+        elif cached.empty:
+            missing.append(yf_symbol)
+        else:
+            stale[yf_symbol] = cached
 
-    score = m * 0.7 + w * 0.3  # bias more towards 1M performance
+    if missing:
+        data = _download(missing, period="6mo")
+        for yf_symbol in missing:
+            frames[yf_symbol] = _store_cache(yf_symbol, _ticker_frame(data, yf_symbol))
 
-    if "Strong SMA uptrend" in sma_trend:
-        score += 5.0
-    elif "Healthy uptrend" in sma_trend:
-        score += 3.0
-    elif "Strong SMA downtrend" in sma_trend:
-        score -= 5.0
+    if stale:
+        start = min(df.index.max() for df in stale.values())
+        data = _download(sorted(stale), start=start.strftime("%Y-%m-%d"))
+        for yf_symbol, cached in stale.items():
+            merged = pd.concat([cached, _ticker_frame(data, yf_symbol)])
+            merged = merged[~merged.index.duplicated(keep="last")].sort_index()
+            frames[yf_symbol] = _store_cache(yf_symbol, merged)
 
-    return round(score, 2)
+    return frames
 
 
 def scan_universe_yf():
@@ -112,14 +226,18 @@ def scan_universe_yf():
         return
 
     rows = []
+    returns = []
+    smas = []
 
     print(f"Scanning {len(universe)} symbols via Yahoo Finance...")
-    for symbol in universe:
-        yf_symbol = nse_to_yahoo(symbol)
-        print(f"  -> {symbol} (Yahoo: {yf_symbol})")
 
-        # ~6 months of daily data
-        df = yf.download(yf_symbol, period="6mo", interval="1d", progress=False)
+    yf_symbols = [nse_to_yahoo(symbol) for symbol in universe]
+    ttl_hours = float((settings.get("cache") or {}).get("ttl_hours", DEFAULT_CACHE_TTL_HOURS))
+    histories = load_history(yf_symbols, ttl_hours=ttl_hours)
+
+    for symbol, yf_symbol in zip(universe, yf_symbols):
+        print(f"  -> {symbol} (Yahoo: {yf_symbol})")
+        df = histories.get(yf_symbol, pd.DataFrame())
 
         if df.empty or df.shape[0] < 60:
             print(f"     Skipping {symbol}: not enough data from Yahoo (need at least 60 bars).")
@@ -130,32 +248,25 @@ def scan_universe_yf():
             print(f"     Skipping {symbol}: missing Close data from Yahoo.")
             continue
 
-        df = df.sort_index()
-
-        # Compute SMAs
-        df["SMA20"] = df["Close"].rolling(window=20).mean()
-        df["SMA50"] = df["Close"].rolling(window=50).mean()
-        df["SMA200"] = df["Close"].rolling(window=200).mean()
+        # Cached/downloaded bars are normally in date order already.
+        if not df.index.is_monotonic_increasing:
+            df = df.sort_index()
 
-        latest_row = df.iloc[-1]
-        latest_close = latest_row["Close"]
-        sma20 = latest_row["SMA20"]
-        sma50 = latest_row["SMA50"]
-        sma200 = latest_row["SMA200"]
-
-        # Need valid SMAs: if 200-day SMA is NaN (insufficient history), still allow, but mark trend mixed
-        if pd.isna(sma20) or pd.isna(sma50) or pd.isna(sma200):
-            sma_trend = "SMA data incomplete"
-        else:
-            sma_trend = classify_sma_trend(float(latest_close), float(sma20), float(sma50), float(sma200))
+        # One close array; SMAs and returns below only read its tail.
+        closes = df["Close"].to_numpy(dtype="float64")
+        latest_close = closes[-1]
+        # Only the latest SMA values are used: mean of the last window closes.
+        sma20, sma50, sma200 = (
+            closes[-w:].mean() if closes.size >= w else np.nan for w in (20, 50, 200)
+        )
 
         # Returns
-        day_ret = compute_return(latest_close, df["Close"].iloc[-2]) if df.shape[0] >= 2 else None
-        week_ret = compute_return(latest_close, df["Close"].iloc[-6]) if df.shape[0] >= 6 else None
-        month_ret = compute_return(latest_close, df["Close"].iloc[-22]) if df.shape[0] >= 22 else None
+        day_ret = pct_return(closes, 1)
+        week_ret = pct_return(closes, 5)
+        month_ret = pct_return(closes, 21)
 
-        rating = classify_stock(day_ret, week_ret, month_ret)
-        swing_score = compute_swing_score(month_ret, week_ret, sma_trend)
+        returns.append((day_ret, week_ret, month_ret))
+        smas.append((float(latest_close), float(sma20), float(sma50), float(sma200)))
 
         rows.append(
             {
@@ -168,9 +279,6 @@ def scan_universe_yf():
                 "sma20": round(float(sma20), 2) if not pd.isna(sma20) else None,
                 "sma50": round(float(sma50), 2) if not pd.isna(sma50) else None,
                 "sma200": round(float(sma200), 2) if not pd.isna(sma200) else None,
-                "sma_trend": sma_trend,
-                "rating": rating,
-                "swing_score": swing_score,
             }
         )
 
@@ -179,6 +287,17 @@ def scan_universe_yf():
         return
 
     df_report = pd.DataFrame(rows)
+    # Classify every symbol at once, on the unrounded values.
+    price, s20, s50, s200 = (np.array(col, dtype="float64") for col in zip(*smas))
+    sma_trend = classify_sma_trend(price, s20, s50, s200)
+    # None -> NaN -> 0.0 in one pass per column: missing returns count as flat.
+    day_rets, week_rets, month_rets = np.nan_to_num(np.array(returns, dtype="float64").T, nan=0.0)
+    # Labels as categoricals: one codes array per column, same CSV text.
+    df_report["sma_trend"] = pd.Categorical.from_codes(sma_trend, categories=SMA_TREND_LABELS)
+    df_report["rating"] = pd.Categorical.from_codes(
+        classify_stock(day_rets, week_rets, month_rets), categories=RATING_LABELS
+    )
+    df_report["swing_score"] = compute_swing_score(month_rets, week_rets, sma_trend)
     df_report.sort_values(
         by=["swing_score", "month_change_pct", "week_change_pct", "day_change_pct"],
         ascending=[False, False, False, False],
@@ -1,13 +1,39 @@
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
+from enum import IntEnum
 from math import sqrt
-from typing import Optional
+from typing import List, Optional, Sequence, Tuple
 
-import pandas as pd
+import numpy as np
 
 from market_data import PriceDataSource, PriceHistory
 
 
+class TrendCode(IntEnum):
+    """Trend classes from _classify_trend_vec; TREND_LABELS[code] is the label."""
+    INSUFFICIENT = 0
+    STRONG_UP = 1
+    UP = 2
+    UP_SHORT_TERM = 3
+    SIDEWAYS = 4
+    DOWN_SHORT_TERM = 5
+    DOWN = 6
+    STRONG_DOWN = 7
+
+
+TREND_LABELS = (
+    "No clear trend (insufficient data)",
+    "Strong uptrend",
+    "Uptrend",
+    "Uptrend (short-term)",
+    "Sideways / Choppy",
+    "Downtrend (short-term)",
+    "Downtrend",
+    "Strong downtrend",
+)
+
+
 @dataclass
 class TechnicalSnapshot:
     last_close: float
@@ -15,7 +41,11 @@ class TechnicalSnapshot:
     sma50: Optional[float]
     sma200: Optional[float]
     volatility_annual: Optional[float]
-    trend_label: str
+    trend_code: TrendCode
+
+    @property
+    def trend_label(self) -> str:
+        return TREND_LABELS[self.trend_code]
 
 
 class TechnicalAnalysisService:
@@ -28,54 +58,66 @@ class TechnicalAnalysisService:
         self._data_source = data_source
 
     @staticmethod
-    def _compute_sma(series: pd.Series, window: int) -> Optional[float]:
-        if len(series) < window:
-            return None
-        return float(series.rolling(window).mean().iloc[-1])
+    def _last_sma(closes: np.ndarray, lengths: np.ndarray, window: int) -> np.ndarray:
+        """Mean of each row's last `window` closes; NaN where the row is shorter."""
+        sma = np.full(len(closes), np.nan)
+        ok = lengths >= window
+        if ok.any():
+            sma[ok] = closes[ok, -window:].mean(axis=1)
+        return sma
 
     @staticmethod
-    def _compute_annual_volatility(closes: pd.Series) -> Optional[float]:
-        if len(closes) < 10:
-            return None
-        returns = closes.pct_change().dropna()
-        if returns.empty:
-            return None
-        return float(returns.std() * sqrt(252.0))
+    def _annual_volatility(closes: np.ndarray, lengths: np.ndarray) -> np.ndarray:
+        """Annualized std of daily returns per row; NaN for rows under 10 closes."""
+        vol = np.full(len(closes), np.nan)
+        ok = lengths >= 10
+        if ok.any():
+            c = closes[ok]
+            with np.errstate(divide="ignore", invalid="ignore"):
+                returns = c[:, 1:] / c[:, :-1] - 1.0
+            vol[ok] = np.nanstd(returns, axis=1, ddof=1) * sqrt(252.0)
+        return vol
 
     @staticmethod
-    def _classify_trend(
-        last_close: float,
-        sma20: Optional[float],
-        sma50: Optional[float],
-        sma200: Optional[float],
-    ) -> str:
-        if sma20 is None or sma50 is None:
-            return "No clear trend (insufficient data)"
-        if sma200 is None:
-            # Fallback classification without SMA200
-            if last_close > sma50 and sma20 > sma50:
-                return "Uptrend (short-term)"
-            if last_close < sma50 and sma20 < sma50:
-                return "Downtrend (short-term)"
-            return "Sideways / Choppy"
-
-        # Full hierarchy
-        if last_close > sma200 and sma20 > sma50 > sma200:
-            return "Strong uptrend"
-        if last_close > sma50 and sma20 >= sma50:
-            return "Uptrend"
-        if last_close < sma50 and sma20 < sma50 <= sma200:
-            return "Downtrend"
-        if last_close < sma200 and sma50 < sma200:
-            return "Strong downtrend"
-        return "Sideways / Choppy"
-
-    def build_snapshot(
-        self,
-        exchange: str,
-        symbol: str,
-        lookback_days: int = 250,
-    ) -> Optional[TechnicalSnapshot]:
+    def _classify_trend_vec(
+        last_close: np.ndarray,
+        sma20: np.ndarray,
+        sma50: np.ndarray,
+        sma200: np.ndarray,
+    ) -> np.ndarray:
+        """
+        TrendCode per row; NaN SMAs mean insufficient history. Conditions are
+        checked in order, so each mask only needs its own comparisons.
+        """
+        no_short = np.isnan(sma20) | np.isnan(sma50)
+        no_200 = np.isnan(sma200)
+        with np.errstate(invalid="ignore"):
+            conditions = [
+                no_short,
+                # Fallback classification without SMA200
+                no_200 & (last_close > sma50) & (sma20 > sma50),
+                no_200 & (last_close < sma50) & (sma20 < sma50),
+                no_200,
+                # Full hierarchy
+                (last_close > sma200) & (sma20 > sma50) & (sma50 > sma200),
+                (last_close > sma50) & (sma20 >= sma50),
+                (last_close < sma50) & (sma20 < sma50) & (sma50 <= sma200),
+                (last_close < sma200) & (sma50 < sma200),
+            ]
+        choices = [
+            TrendCode.INSUFFICIENT,
+            TrendCode.UP_SHORT_TERM,
+            TrendCode.DOWN_SHORT_TERM,
+            TrendCode.SIDEWAYS,
+            TrendCode.STRONG_UP,
+            TrendCode.UP,
+            TrendCode.DOWN,
+            TrendCode.STRONG_DOWN,
+        ]
+        return np.select(conditions, choices, default=TrendCode.SIDEWAYS)
+
+    def _closes(self, key: Tuple[str, str], lookback_days: int) -> Optional[np.ndarray]:
+        exchange, symbol = key
         hist: PriceHistory = self._data_source.get_history(
             exchange=exchange, symbol=symbol, lookback_days=lookback_days
         )
@@ -89,27 +131,70 @@ class TechnicalAnalysisService:
             )
             return None
 
-        closes = df["close"].dropna()
-        if closes.empty:
+        closes = df["close"].dropna().to_numpy(dtype="float64")
+        if closes.size == 0:
             logging.warning(
                 "No valid close prices for %s:%s, cannot compute technicals.",
                 exchange,
                 symbol,
             )
             return None
+        return closes
 
-        last_close = float(closes.iloc[-1])
-        sma20 = self._compute_sma(closes, 20)
-        sma50 = self._compute_sma(closes, 50)
-        sma200 = self._compute_sma(closes, 200)
-        vol_annual = self._compute_annual_volatility(closes)
-        trend = self._classify_trend(last_close, sma20, sma50, sma200)
-
-        return TechnicalSnapshot(
-            last_close=last_close,
-            sma20=sma20,
-            sma50=sma50,
-            sma200=sma200,
-            volatility_annual=vol_annual,
-            trend_label=trend,
-        )
+    def build_snapshots_batch(
+        self,
+        keys: Sequence[Tuple[str, str]],
+        lookback_days: int = 250,
+        max_workers: Optional[int] = None,
+    ) -> List[Optional[TechnicalSnapshot]]:
+        """
+        Snapshots for many (exchange, symbol) pairs, in the same order.
+
+        Histories are fetched (optionally on max_workers threads), right-aligned
+        into one NaN-padded (n_symbols, n_days) array, and SMAs/volatility are
+        computed for all symbols at once. None where a symbol has no closes.
+        """
+        if max_workers and max_workers > 1 and len(keys) > 1:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                series = list(executor.map(lambda k: self._closes(k, lookback_days), keys))
+        else:
+            series = [self._closes(k, lookback_days) for k in keys]
+
+        rows = [i for i, c in enumerate(series) if c is not None]
+        snapshots: List[Optional[TechnicalSnapshot]] = [None] * len(keys)
+        if not rows:
+            return snapshots
+
+        lengths = np.array([series[i].size for i in rows])
+        closes = np.full((len(rows), int(lengths.max())), np.nan)
+        for r, i in enumerate(rows):
+            closes[r, closes.shape[1] - lengths[r]:] = series[i]
+
+        last = closes[:, -1]
+        sma20 = self._last_sma(closes, lengths, 20)
+        sma50 = self._last_sma(closes, lengths, 50)
+        sma200 = self._last_sma(closes, lengths, 200)
+        vol = self._annual_volatility(closes, lengths)
+        trend = self._classify_trend_vec(last, sma20, sma50, sma200)
+
+        def opt(v: float) -> Optional[float]:
+            return None if np.isnan(v) else float(v)
+
+        for r, i in enumerate(rows):
+            snapshots[i] = TechnicalSnapshot(
+                last_close=float(last[r]),
+                sma20=opt(sma20[r]),
+                sma50=opt(sma50[r]),
+                sma200=opt(sma200[r]),
+                volatility_annual=opt(vol[r]),
+                trend_code=TrendCode(trend[r]),
+            )
+        return snapshots
+
+    def build_snapshot(
+        self,
+        exchange: str,
+        symbol: str,
+        lookback_days: int = 250,
+    ) -> Optional[TechnicalSnapshot]:
+        return self.build_snapshots_batch([(exchange, symbol)], lookback_days=lookback_days)[0]
@@ -1,14 +1,6 @@
-import os
-import yaml
 import pandas as pd
 
-PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-SETTINGS_PATH = os.path.join(PROJECT_ROOT, "config", "settings.yaml")
-
-
-def load_settings():
-    with open(SETTINGS_PATH, "r") as f:
-        return yaml.safe_load(f)
+from core.risk_manager import load_settings
 
 
 class SwingTrendStrategy:
@@ -21,22 +13,27 @@ class SwingTrendStrategy:
         if df.shape[0] < self.lookback:
             return None
 
-        df = df.copy()
-        df["ma_short"] = df["close"].rolling(self.cfg["ma_short"]).mean()
-        df["ma_long"] = df["close"].rolling(self.cfg["ma_long"]).mean()
-
-        last = df.iloc[-1]
-        prev = df.iloc[-2]
+        close = df["close"].to_numpy(dtype="float64")
+        volume = df["volume"].to_numpy(dtype="float64")
+        short_w, long_w = self.cfg["ma_short"], self.cfg["ma_long"]
 
-        if last["volume"] < self.cfg["min_volume"]:
+        if volume[-1] < self.cfg["min_volume"]:
             return None
+        # Need one bar before the latest full long window.
+        if close.size <= max(short_w, long_w):
+            return None
+
+        # Only the last two values of each moving average are needed.
+        ma_short, ma_short_prev = close[-short_w:].mean(), close[-short_w - 1:-1].mean()
+        ma_long, ma_long_prev = close[-long_w:].mean(), close[-long_w - 1:-1].mean()
+        last_close = close[-1]
 
-        bullish_cross = prev["ma_short"] <= prev["ma_long"] and last["ma_short"] > last["ma_long"]
-        if bullish_cross and last["close"] > last["ma_short"] and last["close"] > last["ma_long"]:
+        bullish_cross = ma_short_prev <= ma_long_prev and ma_short > ma_long
+        if bullish_cross and last_close > ma_short and last_close > ma_long:
             return {
                 "symbol": symbol,
                 "side": "BUY",
-                "entry_price": float(last["close"]),
+                "entry_price": float(last_close),
             }
 
         return None